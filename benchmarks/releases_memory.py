@@ -0,0 +1,38 @@
+"""
+Memory used by PackageObject.releases for a package with a long release history.
+
+Compares a dict of URLReleaseObject lists (every file of every release) against
+otlet.releases.ReleaseTable,
+both built from the same (already downloaded) API response.
+
+    python benchmarks/releases_memory.py [package]
+"""
+import sys
+import json
+import tracemalloc
+from urllib.request import urlopen
+from otlet.api import URLReleaseObject
+from otlet.releases import ReleaseTable
+
+
+def measure(build, data):
+    tracemalloc.start()
+    obj = build(data)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def main(package: str = "botocore") -> None:
+    data = json.load(urlopen(f"https://pypi.org/pypi/{package}/json"))["releases"]
+    _, as_dict = measure(
+        lambda d: {k: [URLReleaseObject.construct(f) for f in v] for k, v in d.items() if v}, data
+    )
+    table, as_table = measure(ReleaseTable, data)
+    print(f"{package}: {len(table)} releases, {sum(len(v) for v in data.values())} files")
+    print(f"  dict of URLReleaseObject: {as_dict / 1024:10.1f} KiB")
+    print(f"  ReleaseTable:             {as_table / 1024:10.1f} KiB ({as_dict / as_table:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
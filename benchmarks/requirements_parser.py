@@ -0,0 +1,182 @@
+"""
+Throughput of PackageInfoObject._parse_dependencies against the parser it replaced.
+
+The corpus is a set of real 'requires_dist' lists, repeated the way common requirements
+repeat across a large dependency scan.
+
+    python benchmarks/requirements_parser.py
+"""
+import re
+import timeit
+from typing import Any, Dict, Optional, Tuple
+from otlet.api import PackageInfoObject
+from otlet.markers import DEPENDENCY_ENVIRONMENT_MARKERS
+
+CORPUS = [
+    [
+        'charset_normalizer<4,>=2',
+        'idna<4,>=2.5',
+        'urllib3<3,>=1.21.1',
+        'certifi>=2017.4.17',
+        'PySocks!=1.5.7,>=1.5.6; extra == "socks"',
+        'chardet<6,>=3.0.2; extra == "use-chardet-on-py3"',
+    ],
+    [
+        'jmespath<2.0.0,>=0.7.1',
+        'python-dateutil<3.0.0,>=2.1',
+        'urllib3<1.27,>=1.25.4; python_version < "3.10"',
+        'urllib3!=2.2.0,<3,>=1.25.4; python_version >= "3.10"',
+        'awscrt==0.21.2; extra == "crt"',
+    ],
+    [
+        'pygame; extra == "aigaming"',
+        'otlet (>=1.0.0rc1,<2.0.0); os_name == "posix"',
+        'otlet-cli (>=1.0.0rc4,<2.0.0); sys_platform == "linux" and os_name == "posix"',
+        'django (>=4.0.3,<5.0.0); platform_machine == "aarch64" and platform_python_implementation == "CPython"',
+        'tensorflow (>=2.9.1,<3.0.0); (python_version >= "3.7") and (extra == "alleniverson" or extra == "aigaming")',
+        'sphinx[lint] (>=5.0.2,<6.0.0)',
+    ],
+    [
+        'typing-extensions>=4.6.0; python_version < "3.13"',
+        'six>=1.5',
+        'colorama; sys_platform == "win32"',
+        'importlib-metadata>=3.6; python_version < "3.10"',
+        'coverage[toml]>=5.0.2; extra == "testing"',
+        'pytest>=6; extra == "testing"',
+    ],
+]
+
+
+def legacy_parse_dependencies(
+    reqs: list, extras: Optional[list], disregard_extras, disregard_markers
+) -> Tuple[Optional[dict], Optional[tuple]]:
+    # if you're reading this, i'm so sorry
+    # i know this is bad, but honestly it works and i'm too scared
+    # to touch it, at least for right now. so yeah.
+
+    if not reqs:
+        return (None, None)
+    if not extras:
+        extras = []
+
+    packages: Dict[Any, Any] = {}
+    root_extras = set()
+    for req in reqs:
+        req_split = req.split(";")
+
+        _pkg = req_split[0].split()  # package name
+        _p_match = re.match(
+            r"(\S+?)([!><=]+)(\S+)", _pkg[0]
+        )  # match for non-parenthetical version constraints (i.e. 'coverage[toml]>=5.0.2')
+        if not _p_match:
+            pkg = _pkg[0]
+            pkg_vcon = (
+                _pkg[1] if len(_pkg) > 1 else None
+            )  # dependency version constraint(s)
+        else:
+            pkg = _p_match.group(1)
+            pkg_vcon = _p_match.group(2) + _p_match.group(
+                3
+            )  # dependency version constraint(s)
+
+        pkgq = (
+            req_split[1].split(" and ") if len(req_split) > 1 else None
+        )  # installation qualifiers (extras, platform dependencies, etc.)
+        if (
+            pkg not in packages.keys()
+        ):  # check if pkg key has already been initialized, due to some packages stating their dependencies multiple times (i.e. 'argon2-cffi')
+            packages[pkg] = {
+                "version_constraints": pkg_vcon,
+                "markers": {},
+                "extras": [],
+            }
+        if (
+            not pkgq
+        ):  # if the dependency has no markers, then no additional parsing is needed
+            continue
+        for constraint in pkgq:
+            _c = constraint.strip().split(" or ")
+            c = []
+            if len(_c) == 1:
+                c = [re.sub(r'[()\s"\']', "", constraint.strip())]
+            else:
+                for i in _c:
+                    c.append(re.sub(r'[()\s"\']', "", i.strip()))
+
+            _m = []
+            for i in c:
+                _m.append(re.match(r"(\w+)([!=<>]+)(\S+)", i))
+
+            for m in _m:
+                if m.group(1) in ["python_version", "python_full_version", "implementation_version"]:  # type: ignore
+                    packages[pkg]["markers"][m.group(1)] = m.group(2) + m.group(3)  # type: ignore
+                    continue
+                if m.group(1) == "extra":  # type: ignore
+                    packages[pkg]["extras"].append(m.group(3))  # type: ignore
+                    continue
+                packages[pkg]["markers"][m.group(1)] = m.group(3)  # type: ignore
+
+    # extra checker
+    if not disregard_extras:
+        for k, v in packages.copy().items():
+            hitcount = 0
+            if v.get("extras"):
+                for extra in v["extras"]:
+                    root_extras.add(extra)
+                    if extra not in extras:
+                        hitcount += 1
+                        if hitcount == len(v["extras"]):
+                            try:
+                                packages.pop(k)
+                            except KeyError:
+                                continue
+
+    # environment marker checker
+    if not disregard_markers:
+        # dictionary holding each package, with info on whether or not
+        # every marker constraint is met for a given package
+        _pkg_wmarks: dict = {}
+        for k in packages:
+            _pkg_wmarks[k] = []
+        for k, v in packages.copy().items():
+            for _k, _v in v["markers"].items():
+                # seperate if condition for python_version-like markers
+                # uses Version.fits_constraints() method to confirm constraint(s)
+                if _k in [
+                    "python_version",
+                    "python_full_version",
+                    "implementation_version",
+                ]:
+                    if DEPENDENCY_ENVIRONMENT_MARKERS[_k].fits_constraints(
+                        re.sub("[)(]", "", _v).split(",")
+                    ):
+                        _pkg_wmarks[k].append(True)
+                    else:
+                        _pkg_wmarks[k].append(False)
+                # regular if condition for all other markers
+                elif _v == DEPENDENCY_ENVIRONMENT_MARKERS[_k]:
+                    _pkg_wmarks[k].append(True)
+                else:
+                    _pkg_wmarks[k].append(False)
+        for k, v in _pkg_wmarks.items():
+            if not all(v):
+                packages.pop(k)
+
+    return packages, tuple(root_extras)
+
+
+def main(rounds: int = 2000) -> None:
+    def run(parse):
+        for reqs in CORPUS:
+            parse(reqs, ["testing"], False, False)
+
+    legacy = timeit.timeit(lambda: run(legacy_parse_dependencies), number=rounds)
+    current = timeit.timeit(lambda: run(PackageInfoObject._parse_dependencies), number=rounds)
+    n = rounds * sum(len(r) for r in CORPUS)
+    print(f"{n} requirements")
+    print(f"  legacy parser:  {legacy:.3f}s ({n / legacy:,.0f} req/s)")
+    print(f"  current parser: {current:.3f}s ({n / current:,.0f} req/s, {legacy / current:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
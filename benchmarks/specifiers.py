@@ -0,0 +1,54 @@
+"""
+Throughput of Version.fits_constraints() against the exec-based implementation it replaced,
+checking a release history against common constraint lists the way
+PackageDependencyObject.get_latest_possible_version() does.
+
+    python benchmarks/specifiers.py
+"""
+import re
+import timeit
+from otlet.packaging.version import Version
+
+VERSIONS = [
+    Version(f"{major}.{minor}.{micro}")
+    for major in range(1, 4)
+    for minor in range(0, 30)
+    for micro in range(0, 10)
+] + [Version("2.0.0rc1"), Version("2.1.0.post1"), Version("3.0.0a2")]
+
+CONSTRAINTS = [
+    [">=1.21.1", "<3"],
+    ["!=2.2.0", "<3", ">=1.25.4"],
+    [">=2017.4.17"],
+    [">=1.0.0rc1", "<2.0.0"],
+    ["==2.9.1"],
+    [">=4.0.3", "<5.0.0", "!=4.0.5"],
+]
+
+
+def legacy_fits_constraints(self, constraints) -> bool:
+    _c = []  # type: ignore
+    if isinstance(constraints, str):
+        constraints = re.sub(r"[)(\s]", "", constraints).split(",")
+    for i in constraints:
+        _h = re.match(r"([=<>!]+)(\S+)", i)
+        exec(f'_c.append(self {_h.group(1)} self.__class__("{_h.group(2)}"))')  # type: ignore
+    return not any([not _ for _ in _c])
+
+
+def main(rounds: int = 3) -> None:
+    def run(fits):
+        for constraints in CONSTRAINTS:
+            for v in VERSIONS:
+                fits(v, constraints)
+
+    legacy = timeit.timeit(lambda: run(legacy_fits_constraints), number=rounds)
+    current = timeit.timeit(lambda: run(Version.fits_constraints), number=rounds)
+    n = rounds * len(CONSTRAINTS) * len(VERSIONS)
+    print(f"{n} checks")
+    print(f"  exec-based:  {legacy:.3f}s ({n / legacy:,.0f} checks/s)")
+    print(f"  specifiers:  {current:.3f}s ({n / current:,.0f} checks/s, {legacy / current:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Time spent building URLReleaseObjects for every release file of a package with a long
+release history, with the previous strptime-based upload_time parsing, the fixed-format
+parser, and raw epoch timestamps. ReleaseTable construction is timed as well.
+
+    python benchmarks/upload_times.py [package]
+"""
+import sys
+import json
+import time
+import datetime
+import timeit
+from types import SimpleNamespace
+from urllib.request import urlopen
+from otlet.api import URLReleaseObject
+from otlet.releases import ReleaseTable
+
+
+def legacy_construct(url_release_item):
+    return URLReleaseObject(
+        url_release_item["comment_text"],
+        SimpleNamespace(**url_release_item["digests"]),
+        url_release_item["downloads"],
+        url_release_item["filename"],
+        url_release_item["has_sig"],
+        url_release_item["md5_digest"],
+        url_release_item["packagetype"],
+        url_release_item["python_version"],
+        url_release_item["size"],
+        datetime.datetime(
+            *time.strptime(
+                url_release_item.get("upload_time", url_release_item["upload_time_iso_8601"]),
+                "%Y-%m-%dT%H:%M:%S",
+            )[:6]
+        ),
+        url_release_item["url"],
+        url_release_item["yanked"],
+        url_release_item["yanked_reason"] or None,
+    )
+
+
+def main(package: str = "botocore", rounds: int = 5) -> None:
+    releases = json.load(urlopen(f"https://pypi.org/pypi/{package}/json"))["releases"]
+    items = [f for files in releases.values() for f in files]
+    assert all(legacy_construct(i) == URLReleaseObject.construct(i) for i in items)
+
+    legacy = timeit.timeit(lambda: [legacy_construct(i) for i in items], number=rounds) / rounds
+    current = timeit.timeit(lambda: [URLReleaseObject.construct(i) for i in items], number=rounds) / rounds
+    raw = timeit.timeit(lambda: [URLReleaseObject.construct(i, True) for i in items], number=rounds) / rounds
+    table = timeit.timeit(lambda: ReleaseTable(releases), number=rounds) / rounds
+    print(f"{len(releases)} releases, {len(items)} files of {package}")
+    print(f"  strptime:             {legacy * 1000:.1f}ms")
+    print(f"  fixed-format parser:  {current * 1000:.1f}ms ({legacy / current:.1f}x)")
+    print(f"  raw_timestamps=True:  {raw * 1000:.1f}ms ({legacy / raw:.1f}x)")
+    print(f"  ReleaseTable:         {table * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,47 @@
+"""
+Throughput of Version() on real PyPI version strings, with the canonical-form fast path
+against the full PEP 440 pattern alone.
+
+The corpus is every release version of a handful of popular packages. parse() caches by
+string, so Version() is called directly to measure parsing itself.
+
+    python benchmarks/version_parse.py [package ...]
+"""
+import sys
+import json
+import timeit
+from urllib.request import urlopen
+from otlet.packaging.version import Version, _parse_canonical, _parse_full
+
+PACKAGES = ["botocore", "django", "numpy", "requests", "setuptools", "pip", "tensorflow", "cryptography"]
+
+
+def fetch_corpus(packages):
+    corpus = []
+    for package in packages:
+        corpus.extend(json.load(urlopen(f"https://pypi.org/pypi/{package}/json"))["releases"])
+    return corpus
+
+
+def main(packages=PACKAGES, rounds: int = 20) -> None:
+    corpus = []
+    for v in fetch_corpus(packages):
+        try:
+            Version(v)
+            corpus.append(v)
+        except ValueError:
+            pass  # legacy versions are handled by LegacyVersion
+    canonical = sum(1 for v in corpus if _parse_canonical(v))
+    for v in corpus:
+        assert Version(v)._version == _parse_full(v), v
+
+    full = timeit.timeit(lambda: [_parse_full(v) for v in corpus], number=rounds)
+    fast = timeit.timeit(lambda: [_parse_canonical(v) or _parse_full(v) for v in corpus], number=rounds)
+    n = rounds * len(corpus)
+    print(f"{len(corpus)} versions from {len(packages)} packages, {canonical / len(corpus):.1%} in canonical form")
+    print(f"  full pattern: {full:.3f}s ({n / full:,.0f} versions/s)")
+    print(f"  fast path:    {fast:.3f}s ({n / fast:,.0f} versions/s, {full / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or PACKAGES)
@@ -0,0 +1,33 @@
+"""
+Sorting a package's release versions with version_sort_key() against sorting Version objects,
+whose comparison keys hold Infinity/NegativeInfinity sentinels.
+
+Versions are parsed (and cached) up front, so only the sorting itself is measured.
+
+    python benchmarks/version_sort.py [package]
+"""
+import sys
+import json
+import random
+import timeit
+from urllib.request import urlopen
+from otlet.packaging.version import parse, version_sort_key
+
+
+def main(package: str = "botocore", rounds: int = 50) -> None:
+    versions = [parse(v) for v in json.load(urlopen(f"https://pypi.org/pypi/{package}/json"))["releases"]]
+    random.shuffle(versions)
+    keys = [version_sort_key(v) for v in versions]
+    assert sorted(versions) == [v for _, v in sorted(zip(keys, versions), key=lambda kv: kv[0])]
+
+    objects = timeit.timeit(lambda: sorted(versions), number=rounds)
+    flat = timeit.timeit(lambda: sorted(versions, key=version_sort_key), number=rounds)
+    keys_only = timeit.timeit(lambda: sorted(keys), number=rounds)
+    print(f"{len(versions)} versions of {package}")
+    print(f"  Version objects:        {objects:.3f}s")
+    print(f"  key=version_sort_key:   {flat:.3f}s ({objects / flat:.1f}x)")
+    print(f"  precomputed sort keys:  {keys_only:.3f}s ({objects / keys_only:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
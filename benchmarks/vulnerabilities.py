@@ -0,0 +1,73 @@
+"""
+Time spent checking which of many (name, version) pins are affected by any advisory,
+scanning each package's fixed_in lists per pin versus otlet.vulnerabilities.VulnerabilityIndex.
+Advisories are synthetic, so nothing is downloaded.
+
+    python benchmarks/vulnerabilities.py [packages] [pins]
+"""
+import sys
+import random
+import timeit
+from otlet.api import PackageVulnerabilitiesObject
+from otlet.packaging.version import parse as parse_version
+from otlet.vulnerabilities import VulnerabilityIndex
+
+
+def naive_affected(advisories, version):
+    # the same rule VulnerabilityIndex uses, checked advisory by advisory and fix by fix
+    version = parse_version(version)
+    found = []
+    for advisory in advisories:
+        fixes = sorted(advisory.fixed_in)
+        affected = not fixes or version < fixes[0]
+        for fix, next_fix in zip(fixes, fixes[1:]):
+            if fix.release[:-1] != version.release[: len(fix.release) - 1] and fix < version < next_fix:
+                affected = True
+        if affected:
+            found.append(advisory)
+    return found
+
+
+def main(packages: int = 300, pins: int = 3000, rounds: int = 5) -> None:
+    rng = random.Random(0)
+    advisories = {}
+    for p in range(int(packages)):
+        advisories[f"package-{p}"] = [
+            PackageVulnerabilitiesObject.construct(
+                {
+                    "aliases": [],
+                    "details": "",
+                    "fixed_in": [f"{major}.{rng.randint(0, 9)}.{rng.randint(1, 20)}" for major in range(1, 4)],
+                    "id": f"PYSEC-{p}-{a}",
+                    "link": "",
+                    "source": "osv",
+                }
+            )
+            for a in range(rng.randint(1, 15))
+        ]
+    pinned = [
+        (f"package-{rng.randrange(int(packages))}", f"{rng.randint(0, 4)}.{rng.randint(0, 9)}.{rng.randint(0, 25)}")
+        for _ in range(int(pins))
+    ]
+    index = VulnerabilityIndex()
+    for name, items in advisories.items():
+        index.add(name, items)
+
+    def naive():
+        result = {}
+        for name, version in pinned:
+            found = naive_affected(advisories[name], version)
+            if found:
+                result[(name, version)] = found
+        return result
+
+    assert naive() == index.query(pinned)
+    scan = timeit.timeit(naive, number=rounds) / rounds
+    indexed = timeit.timeit(lambda: index.query(pinned), number=rounds) / rounds
+    print(f"{len(pinned)} pins, {sum(map(len, advisories.values()))} advisories over {len(advisories)} packages")
+    print(f"  fixed_in scans:     {scan * 1000:.1f}ms")
+    print(f"  VulnerabilityIndex: {indexed * 1000:.1f}ms ({scan / indexed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
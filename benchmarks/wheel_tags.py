@@ -0,0 +1,53 @@
+"""
+Time spent ranking every release file of a package against the running environment,
+parsing filenames in a loop and looking tags up in the ordered supported-tag list,
+versus otlet.tags.rank_files (first call, and with filenames already parsed).
+
+    python benchmarks/wheel_tags.py [package]
+"""
+import sys
+import json
+import timeit
+from urllib.request import urlopen
+from otlet.api import URLReleaseObject
+from otlet.tags import parse_wheel_filename, rank_files, supported_tags
+
+
+def naive_rank(files, supported):
+    ordered = [str(t) for t in supported]
+    ranked = []
+    for file in files:
+        if not file.filename.endswith(".whl"):
+            continue
+        _, _, *rest = file.filename[:-4].split("-")
+        pythons, abis, platforms = rest[-3:]
+        ranks = [
+            ordered.index(f"{p}-{a}-{pl}")
+            for p in pythons.split(".")
+            for a in abis.split(".")
+            for pl in platforms.split(".")
+            if f"{p}-{a}-{pl}" in ordered
+        ]
+        if ranks:
+            ranked.append((min(ranks), file))
+    return [f for _, f in sorted(ranked, key=lambda r: r[0])]
+
+
+def main(package: str = "numpy", rounds: int = 5) -> None:
+    releases = json.load(urlopen(f"https://pypi.org/pypi/{package}/json"))["releases"]
+    files = [URLReleaseObject.construct(f) for v in releases.values() for f in v]
+    supported = supported_tags()
+    assert naive_rank(files, supported) == rank_files(files, include_sdist=False)
+
+    naive = timeit.timeit(lambda: naive_rank(files, supported), number=rounds) / rounds
+    parse_wheel_filename.cache_clear()
+    cold = timeit.timeit(lambda: rank_files(files, include_sdist=False), number=1)
+    warm = timeit.timeit(lambda: rank_files(files, include_sdist=False), number=rounds) / rounds
+    print(f"{len(files)} files of {package}, {len(supported)} supported tags")
+    print(f"  filename loop:         {naive * 1000:.1f}ms")
+    print(f"  rank_files (cold):     {cold * 1000:.1f}ms ({naive / cold:.1f}x)")
+    print(f"  rank_files (warm):     {warm * 1000:.1f}ms ({naive / warm:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -26,6 +26,17 @@ CLI tool and wrapper for the PyPI JSON web API
 
 from .api import *
 from .exceptions import *
+from .session import *
+from .cache import *
+from .memo import *
+from .bulk import *
+from .resolver import *
+from .releases import *
+from .requirements import *
+from .markers import *
+from .tags import *
+from .vulnerabilities import *
+from .sync import *
 
 __version__ = "1.0.0"
 __license__ = "MIT"
@@ -0,0 +1,456 @@
+"""
+otlet.aio
+======================
+asyncio counterparts of the objects in :mod:`otlet.api`, built on a stdlib-only HTTP client.
+"""
+#
+# Copyright (c) 2022 Noah Tanner
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+import io
+import ssl
+import time
+import asyncio
+from http.client import HTTPException, parse_headers
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+from .api import (
+    PackageObject,
+    PackageInfoObject,
+    PackageDependencyObject,
+    _RELEASES_KEY,
+    _load_json,
+    _package_url,
+    _parse_package_name,
+    _raise_for_status,
+)
+from .cache import ResponseCache
+from .memo import PackageMemo, get_default_memo
+from .session import (
+    PYPI_URL,
+    HTTPResponse,
+    RequestStats,
+    _CHUNK_SIZE,
+    _REDIRECT_CODES,
+    _MAX_REDIRECTS,
+    _BodyDecoder,
+    _cache_response,
+    _report_stats,
+    _request_headers,
+)
+from .exceptions import PyPIPackageVersionNotFound
+
+_Stream = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class AsyncSession:
+    """
+    asyncio HTTP/1.1 session with a per-host pool of keep-alive connections and a cap
+    on the number of requests in flight. Mirrors :class:`~otlet.session.Session`.
+
+    :param concurrency: Maximum number of requests in flight at once (Default: 10)
+    :type concurrency: int
+
+    :param max_connections: Maximum number of idle connections kept open per host (Default: 10)
+    :type max_connections: int
+
+    :param timeout: Timeout for each request, in seconds (Default: 30)
+    :type timeout: float
+
+    :param cache: On-disk response cache to consult before, and revalidate against, the network (optional)
+    :type cache: :class:`~otlet.cache.ResponseCache`
+
+    :param stats_hook: Called with a :class:`~otlet.session.RequestStats` for every response received over the network (optional)
+    :type stats_hook: Callable[[:class:`~otlet.session.RequestStats`], None]
+
+    .. versionadded:: 1.1.0
+    """
+
+    #: Where responses come from, see :attr:`otlet.session.Session.source_key`
+    source_key: Hashable = PYPI_URL
+
+    def __init__(
+        self,
+        concurrency: int = 10,
+        max_connections: int = 10,
+        timeout: float = 30,
+        cache: Optional[ResponseCache] = None,
+        stats_hook: Optional[Callable[[RequestStats], None]] = None,
+    ) -> None:
+        self.concurrency = concurrency
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.cache = cache
+        self.stats_hook = stats_hook
+        self._pool: Dict[Tuple[str, str, int], List[_Stream]] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._ssl = ssl.create_default_context()
+
+    async def __aenter__(self) -> "AsyncSession":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _acquire(self, key: Tuple[str, str, int], fresh: bool) -> _Stream:
+        idle = self._pool.get(key)
+        while idle and not fresh:
+            reader, writer = idle.pop()
+            if not reader.at_eof():
+                return reader, writer
+            writer.close()
+        scheme, host, port = key
+        return await asyncio.open_connection(
+            host, port, ssl=self._ssl if scheme == "https" else None
+        )
+
+    def _release(self, key: Tuple[str, str, int], stream: _Stream) -> None:
+        idle = self._pool.setdefault(key, [])
+        if len(idle) < self.max_connections:
+            idle.append(stream)
+        else:
+            stream[1].close()
+
+    async def _send(self, method: str, url: str, headers: Dict[str, str]) -> HTTPResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme or "https"
+        default_port = 443 if scheme == "https" else 80
+        host = parts.hostname or ""
+        key = (scheme, host, parts.port or default_port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {parts.netloc}"]
+        lines.extend(f"{k}: {v}" for k, v in headers.items())
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        # a pooled connection may have been closed by the server while idle,
+        # so retry exactly once on a fresh connection before giving up
+        retried = False
+        while True:
+            # an unresponsive host must not hold a concurrency slot forever, so connecting,
+            # sending and reading are all bounded by the timeout
+            reader, writer = await asyncio.wait_for(self._acquire(key, fresh=retried), self.timeout)
+            try:
+                start = time.perf_counter()
+                status, reason, res_headers, decoder, keep_alive = await asyncio.wait_for(
+                    _exchange(reader, writer, payload, method), self.timeout
+                )
+                body = decoder.finish()
+                break
+            except (HTTPException, ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if retried:
+                    raise
+                retried = True
+            except BaseException:
+                # i.e. asyncio.TimeoutError from wait_for(): the connection is left mid-response
+                writer.close()
+                raise
+        if keep_alive:
+            self._release(key, (reader, writer))
+        else:
+            writer.close()
+        _report_stats(self.stats_hook, url, status, decoder, body, start)
+        return HTTPResponse(url, status, reason, res_headers, body)
+
+    async def request(
+        self, method: str, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> HTTPResponse:
+        """Perform an HTTP request, following redirects, and return the fully-read response."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        _headers = _request_headers(headers)
+        cache = self.cache if method == "GET" else None
+        entry = cache.get(url) if cache is not None else None
+        if entry is not None:
+            if cache.is_fresh(entry):  # type: ignore
+                return HTTPResponse.from_cache(entry)
+            _headers.update(entry.conditional_headers())
+
+        async with self._semaphore:
+            _url = url
+            for _ in range(_MAX_REDIRECTS + 1):
+                res = await self._send(method, _url, _headers)
+                if res.status not in _REDIRECT_CODES:
+                    break
+                _url = urljoin(_url, res.headers["Location"])
+        return _cache_response(cache, entry, url, res)
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HTTPResponse:
+        """Shorthand for ``request("GET", url, headers)``."""
+        return await self.request("GET", url, headers)
+
+    async def close(self) -> None:
+        """Close every pooled connection."""
+        pool, self._pool = self._pool, {}
+        for streams in pool.values():
+            for _, writer in streams:
+                writer.close()
+
+
+async def _exchange(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, payload: bytes, method: str
+) -> Tuple[int, str, Any, _BodyDecoder, bool]:
+    writer.write(payload)
+    await writer.drain()
+    return await _read_response(reader, method)
+
+
+async def _read_response(
+    reader: asyncio.StreamReader, method: str
+) -> Tuple[int, str, Any, _BodyDecoder, bool]:
+    status_line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+    if not status_line:
+        raise ConnectionResetError("connection closed before a response was received")
+    version, _, rest = status_line.partition(" ")
+    status_s, _, reason = rest.partition(" ")
+    status = int(status_s)
+
+    raw_headers = []
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        raw_headers.append(line)
+    headers = parse_headers(io.BytesIO(b"".join(raw_headers) + b"\r\n"))
+
+    keep_alive = version == "HTTP/1.1" and headers.get("Connection", "").lower() != "close"
+    decoder = _BodyDecoder(headers.get("Content-Encoding"))
+    if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+        pass
+    elif headers.get("Transfer-Encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0], 16)
+            if not size:
+                break
+            decoder.feed(await reader.readexactly(size))
+            await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass  # trailers
+    elif headers.get("Content-Length") is not None:
+        remaining = int(headers["Content-Length"])
+        while remaining:
+            chunk = await reader.readexactly(min(remaining, _CHUNK_SIZE))
+            decoder.feed(chunk)
+            remaining -= len(chunk)
+    else:
+        chunk = await reader.read(_CHUNK_SIZE)
+        while chunk:
+            decoder.feed(chunk)
+            chunk = await reader.read(_CHUNK_SIZE)
+        keep_alive = False
+    return status, reason, headers, decoder, keep_alive
+
+
+async def _fetch_json(
+    session: AsyncSession,
+    name: str,
+    release: Optional[str] = None,
+    skip_releases: bool = False,
+) -> Dict[str, Any]:
+    # same flow as api._PackageBase._attempt_request
+    if release:
+        res = await session.get(_package_url(name, release))
+        if res.status == 404:
+            probe = await session.get(_package_url(name))
+            if probe.status == 200:
+                raise PyPIPackageVersionNotFound(name, release)
+            res = probe
+    else:
+        res = await session.get(_package_url(name))
+    _raise_for_status(res, name)
+    return _load_json(res.body, _RELEASES_KEY if skip_releases or release else None)
+
+
+class _AwaitableMixin:
+    _session: Optional[AsyncSession]
+    _build: Callable[[AsyncSession], Awaitable[None]]
+
+    def __await__(self):
+        return self._fetch().__await__()
+
+    async def _fetch(self):
+        if self._session is not None:
+            await self._build(self._session)
+        else:
+            async with AsyncSession() as session:
+                await self._build(session)
+        return self
+
+
+class AsyncPackageObject(_AwaitableMixin, PackageObject):
+    """
+    Awaitable counterpart of :class:`~otlet.api.PackageObject`. The request is made,
+    and the object populated, when it is awaited::
+
+        pkg = await AsyncPackageObject("otlet", session=session)
+
+    :param package_name: Name of PyPI package to query
+    :type package_name: str
+
+    :param release: Specific version to query (optional)
+    :type release: str
+
+    :param session: Async HTTP session to use; a temporary one is created if not given (optional)
+    :type session: :class:`AsyncSession`
+
+    Any other keyword arguments are passed on to :class:`~otlet.api.PackageObject`.
+
+    .. versionadded:: 1.1.0
+    """
+
+    def __init__(
+        self,
+        package_name: str,
+        release: Optional[str] = None,
+        session: Optional[AsyncSession] = None,
+        **kwargs,
+    ) -> None:
+        self._args = (package_name, release, kwargs)
+        self._session = session
+
+    async def _build(self, session: AsyncSession) -> None:
+        package_name, release, kwargs = self._args
+        data = await _fetch_json(
+            session,
+            _parse_package_name(package_name)[0],
+            release,
+            kwargs.get("skip_releases", False),
+        )
+        PackageObject.__init__(self, package_name, release, http_response=data, **kwargs)
+
+
+class AsyncPackageInfoObject(_AwaitableMixin, PackageInfoObject):
+    """
+    Awaitable counterpart of :class:`~otlet.api.PackageInfoObject`::
+
+        info = await AsyncPackageInfoObject("otlet", session=session)
+
+    :param package_name: Name of PyPI package to query
+    :type package_name: str
+
+    :param release: Specific version to query (optional)
+    :type release: str
+
+    :param session: Async HTTP session to use; a temporary one is created if not given (optional)
+    :type session: :class:`AsyncSession`
+
+    Any other keyword arguments are passed on to :class:`~otlet.api.PackageInfoObject`.
+
+    .. versionadded:: 1.1.0
+    """
+
+    def __init__(
+        self,
+        package_name: str,
+        release: Optional[str] = None,
+        session: Optional[AsyncSession] = None,
+        **kwargs,
+    ) -> None:
+        self._args = (package_name, release, kwargs)
+        self._session = session
+
+    async def _build(self, session: AsyncSession) -> None:
+        package_name, release, kwargs = self._args
+        name, extras = _parse_package_name(package_name)
+        data = await _fetch_json(session, name, release, skip_releases=True)
+        PackageInfoObject.__init__(
+            self, package_name, extras, release, False, data, **kwargs
+        )
+
+
+class _Populator:
+    """Shared state for one populate run: dedupes concurrent fetches of the same package."""
+
+    def __init__(self, session: AsyncSession, memo: PackageMemo) -> None:
+        self.session = session
+        self.memo = memo
+        self._inflight: Dict[Any, "asyncio.Future[PackageObject]"] = {}
+
+    async def package(self, name: str, release: Optional[str] = None) -> PackageObject:
+        key = self.memo.make_key(name, release, session=self.session)
+        obj = self.memo.lookup(key)
+        if obj is not None:
+            return obj
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(self._build(name, release))
+            self._inflight[key] = fut
+        try:
+            obj = await fut
+        finally:
+            self._inflight.pop(key, None)
+        return self.memo.add(key, obj)
+
+    async def _build(self, name: str, release: Optional[str]) -> PackageObject:
+        data = await _fetch_json(self.session, _parse_package_name(name)[0], release)
+        return PackageObject(name, release, http_response=data)
+
+    async def populate_one(self, dep: PackageDependencyObject) -> None:
+        version = dep._select_version(await self.package(dep.name))
+        dep._populate_from(await self.package(dep.name, str(version) if version else None))
+
+    async def populate_levels(self, deps: Iterable[PackageDependencyObject], depth: int) -> None:
+        level = list(deps)
+        while level:
+            # the same object can be reachable from several parents
+            unique = {id(d): d for d in level if not d.is_populated}
+            await asyncio.gather(*(self.populate_one(d) for d in unique.values()))
+            if depth <= 0:
+                return
+            depth -= 1
+            level = [j for d in level for j in (d.dependencies or [])]
+
+
+async def populate(
+    dependency: PackageDependencyObject,
+    recursion_depth: int = 0,
+    session: Optional[AsyncSession] = None,
+) -> None:
+    """Awaitable counterpart of :meth:`~otlet.api.PackageDependencyObject.populate`.
+    Every dependency at a given depth is fetched concurrently."""
+    await populate_dependencies([dependency], recursion_depth, session)
+
+
+async def populate_dependencies(
+    package: Any, depth: int = 0, session: Optional[AsyncSession] = None
+) -> None:
+    """Awaitable counterpart of :meth:`~otlet.api.PackageObject.populate_dependencies`.
+    Accepts a :class:`~otlet.api.PackageObject` or an iterable of :class:`~otlet.api.PackageDependencyObject`,
+    and fetches every dependency at a given depth concurrently."""
+    deps = package.dependencies if isinstance(package, PackageObject) else package
+    if not deps:
+        return
+    if session is not None:
+        await _Populator(session, get_default_memo()).populate_levels(deps, depth)
+        return
+    async with AsyncSession() as _session:
+        await _Populator(_session, get_default_memo()).populate_levels(deps, depth)
+
+
+__all__ = [
+    "AsyncSession",
+    "AsyncPackageObject",
+    "AsyncPackageInfoObject",
+    "populate",
+    "populate_dependencies",
+]
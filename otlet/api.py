@@ -25,65 +25,141 @@ Classes used by otlet for storing data returned from PyPI Web API.
 # OR OTHER DEALINGS IN THE SOFTWARE.
 
 import re
-import time
 import datetime
 import json
-from http.client import HTTPResponse
-from urllib.request import urlopen
+from functools import lru_cache
 from urllib.error import HTTPError
-from typing import Any, Optional, Dict, List, NamedTuple, Tuple
+from typing import TYPE_CHECKING, Any, Optional, Dict, List, NamedTuple, Tuple, Union
 from types import SimpleNamespace
-from .markers import DEPENDENCY_ENVIRONMENT_MARKERS
+from warnings import warn
+from .markers import DEPENDENCY_ENVIRONMENT_MARKERS, _Environment, compile_marker
+from .memo import canonicalize_name, get_default_memo
+from .util import _cached_property, _parse_upload_time, _upload_timestamp
+from .requirements import parse_requirement
+from .session import PYPI_URL, HTTPResponse, Session, get_default_session
 from .packaging.version import Version, parse as parse_version
 from .exceptions import (
     OtletError,
     NotPopulatedError,
+    InvalidRequirement,
+    InvalidMarker,
     PyPIServiceDown,
     PyPIPackageNotFound,
     PyPIPackageVersionNotFound,
 )
 
+if TYPE_CHECKING:
+    from .releases import ReleaseTable, VersionIndex  # releases imports this module
+
 
 class _PackageBase:
     """
     Base for :class:`~PackageObject` and :class:`~PackageInfoObject`. Should not be directly instantiated.
     """
 
-    def __init__(self, package_name: str, release: Optional[str] = None) -> None:
-        # parse package_name for extras
-        _parsed_name = (
-            re.compile(r"[\[\]]").sub(",", package_name).strip(",").split(",")
-        )
-        self.name = _parsed_name[0]
-        if len(_parsed_name) == 2:
-            self.extras = [_parsed_name[1]]
-        else:
-            self.extras = []
-
+    def __init__(
+        self,
+        package_name: str,
+        release: Optional[str] = None,
+        session: Optional[Session] = None,
+        http_response: Optional[Dict[str, Any]] = None,
+        skip_releases: bool = False,
+    ) -> None:
+        self.name, self.extras = _parse_package_name(package_name)
         self.release = release
+        self.session = session or get_default_session()
+        self._skip_releases = bool(skip_releases or release)
+        if http_response is not None:
+            # already fetched elsewhere (i.e. by otlet.aio), skip the request
+            self._http_response = None
+            self.http_response = http_response
+            return
         self._http_response = self._attempt_request()
-        self.http_response = json.loads(self._http_response.readlines()[0].decode())
+        self.http_response = _load_json(
+            self._http_response.body, _RELEASES_KEY if self._skip_releases else None
+        )
+        # the decoded response is all that's needed from here on, don't keep the payload around too
+        self._http_response.body = b""
 
     def _attempt_request(self) -> HTTPResponse:
         """Attempt PyPI API request for package. You should not need to call this function directly."""
-        _pkexists = False
-        try:
-            res = urlopen(f"https://pypi.org/pypi/{self.name}/json")
-            _pkexists = True
-            if self.release:
-                res = urlopen(f"https://pypi.org/pypi/{self.name}/{self.release}/json")
-        except HTTPError as err:
-            if err.code == 404:
-                if _pkexists:
-                    raise PyPIPackageVersionNotFound(self.name, self.release) from err # type: ignore
-                raise PyPIPackageNotFound(self.name) from err
-            if err.code == 503:
-                raise PyPIServiceDown from err
-            else:
-                raise err
+        if self.release:
+            # fetch the pinned release directly, and only probe the base package
+            # when PyPI 404s so we can tell a missing package from a missing version
+            res = self.session.get(_package_url(self.name, self.release))
+            if res.status == 404:
+                probe = self.session.get(_package_url(self.name))
+                if probe.status == 200:
+                    raise PyPIPackageVersionNotFound(self.name, self.release)
+                res = probe
+        else:
+            res = self.session.get(_package_url(self.name))
+        _raise_for_status(res, self.name)
         return res
 
 
+def _parse_package_name(package_name: str) -> Tuple[str, List[str]]:
+    # parse package_name for extras
+    try:
+        _req = parse_requirement(package_name)
+    except InvalidRequirement:
+        return package_name, []  # let PyPI decide whether it exists
+    return _req.name, list(_req.extras)
+
+
+def _package_url(name: str, release: Optional[str] = None) -> str:
+    if release:
+        return f"{PYPI_URL}/pypi/{name}/{release}/json"
+    return f"{PYPI_URL}/pypi/{name}/json"
+
+
+_RELEASES_KEY = "releases"
+_discarding_decoder = json.JSONDecoder(object_pairs_hook=lambda pairs: None)
+
+
+def _load_json(body: bytes, skip_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Decode a PyPI JSON response straight from its bytes.
+    The value of top-level key ``skip_key`` (i.e. the often huge 'releases') is scanned past
+    without being built, and replaced with an empty dictionary.
+    """
+    if skip_key is None:
+        return json.loads(body)
+    text = body.decode()
+    key_at = text.find(f'"{skip_key}"')
+    if key_at == -1:
+        return json.loads(text)
+    # decode the top-level object a member at a time, so the skipped value is never kept
+    data: Dict[str, Any] = {}
+    decoder = json.JSONDecoder()
+    end = len(text)
+    i = text.index("{") + 1
+    while i < end:
+        while text[i] in " \t\r\n,":
+            i += 1
+        if text[i] == "}":
+            break
+        key, i = decoder.raw_decode(text, i)
+        i = text.index(":", i) + 1
+        while text[i] in " \t\r\n":
+            i += 1
+        if key == skip_key:
+            _, i = _discarding_decoder.raw_decode(text, i)
+            data[key] = {}
+        else:
+            data[key], i = decoder.raw_decode(text, i)
+    return data
+
+
+def _raise_for_status(res: HTTPResponse, name: str) -> None:
+    if res.status == 404:
+        raise PyPIPackageNotFound(name)
+    if res.status == 503:
+        raise PyPIServiceDown
+    if res.status != 200:
+        raise HTTPError(res.url, res.status, res.reason, res.headers, None)  # type: ignore
+
+
 class PackageInfoObject(_PackageBase):
     """
     Object containing information about a given PyPI package. Data taken from the 'info' API response key.
@@ -106,6 +182,9 @@ class PackageInfoObject(_PackageBase):
     :param disregard_markers: Whether or not the dependency parser should care about environment markers (excluding extras) when parsing (Default: False)
     :type disregard_markers: bool
 
+    :param session: HTTP session used for any requests made by this object and its dependencies (optional)
+    :type session: :class:`~otlet.session.Session`
+
     :var author: Author of the package
     :vartype author: str
 
@@ -203,10 +282,13 @@ class PackageInfoObject(_PackageBase):
         http_response: Dict[str, Any] = None,
         disregard_extras=False,
         disregard_markers=False,
+        session: Optional[Session] = None,
     ) -> None:
         if perform_request:
-            super().__init__(package_name, release)
+            # only 'info' is used here, so don't decode the (possibly huge) 'releases'
+            super().__init__(package_name, release, session, skip_releases=True)
         else:
+            self.session = session or get_default_session()
             if http_response:
                 self.http_response = http_response
             else:
@@ -214,6 +296,7 @@ class PackageInfoObject(_PackageBase):
                     "If not performing a new HTTP request, you must supply a dictionary-parsed HTTPResponse into 'http_response'."
                 )
 
+        self._dependency_options = (package_extras, disregard_extras, disregard_markers)
         for k, v in self.http_response["info"].items():
             if v == "":
                 self.__dict__[k] = None
@@ -224,138 +307,141 @@ class PackageInfoObject(_PackageBase):
                     v, package_extras, disregard_extras, disregard_markers
                 )
                 self._parsed_deps = _parsed
-                if _parsed:
-                    _obj = [
-                        PackageDependencyObject(
-                            k, v["version_constraints"], v["markers"], v["extras"]
-                        )
-                        for k, v in _parsed.items()
-                    ]
-                    self.__dict__[k] = _obj
-                else:
-                    self.__dict__[k] = None
+                self.__dict__[k] = self._dependency_objects(_parsed)
             else:
                 self.__dict__[k] = v
 
+    def _dependency_objects(
+        self, parsed: Optional[Dict[str, Dict[str, Any]]]
+    ) -> Optional[List["PackageDependencyObject"]]:
+        if not parsed:
+            return None
+        return [
+            PackageDependencyObject(
+                k,
+                v["version_constraints"],
+                v["markers"],
+                v["extras"],
+                self.session,
+            )
+            for k, v in parsed.items()
+        ]
+
+    def dependencies_for_environments(
+        self, environments: List[Dict[str, Any]]
+    ) -> List[Optional[List["PackageDependencyObject"]]]:
+        """
+        Work out which dependencies apply in each of several environments, from this single response.
+
+        Each environment is a dictionary of PEP 508 environment markers (i.e. ``{"python_version": "3.8", "sys_platform": "win32"}``);
+        any marker it leaves out takes its value from :data:`~otlet.markers.DEPENDENCY_ENVIRONMENT_MARKERS`.
+        Requirements and markers are parsed once, and each distinct comparison in them is evaluated once, for all environments.
+
+        :param environments: Environments to evaluate dependencies for
+        :type environments: List[Dict[str, Any]]
+
+        :return: A list of dependencies (or None) for each environment, in the same order as ``environments``
+
+        .. versionadded:: 1.1.0
+        """
+        package_extras, disregard_extras, disregard_markers = self._dependency_options
+        reqs = self.http_response["info"].get("requires_dist")
+        return [
+            self._dependency_objects(
+                self._parse_dependencies(
+                    reqs,
+                    package_extras,
+                    disregard_extras,
+                    disregard_markers,
+                    _Environment(env),
+                )[0]
+            )
+            for env in environments
+        ]
+
     @staticmethod
     def _parse_dependencies(
-        reqs: list, extras: Optional[list], disregard_extras, disregard_markers
+        reqs: list,
+        extras: Optional[list],
+        disregard_extras,
+        disregard_markers,
+        environment: Optional[Dict[str, Any]] = None,
     ) -> Tuple[Optional[dict], Optional[tuple]]:
-        # if you're reading this, i'm so sorry
-        # i know this is bad, but honestly it works and i'm too scared
-        # to touch it, at least for right now. so yeah.
-
         if not reqs:
             return (None, None)
         if not extras:
             extras = []
 
-        packages: Dict[Any, Any] = {}
+        packages: Dict[str, Dict[str, Any]] = {}
         root_extras = set()
         for req in reqs:
-            req_split = req.split(";")
-
-            _pkg = req_split[0].split()  # package name
-            _p_match = re.match(
-                r"(\S+?)([!><=]+)(\S+)", _pkg[0]
-            )  # match for non-parenthetical version constraints (i.e. 'coverage[toml]>=5.0.2')
-            if not _p_match:
-                pkg = _pkg[0]
-                pkg_vcon = (
-                    _pkg[1] if len(_pkg) > 1 else None
-                )  # dependency version constraint(s)
-            else:
-                pkg = _p_match.group(1)
-                pkg_vcon = _p_match.group(2) + _p_match.group(
-                    3
-                )  # dependency version constraint(s)
-
-            pkgq = (
-                req_split[1].split(" and ") if len(req_split) > 1 else None
-            )  # installation qualifiers (extras, platform dependencies, etc.)
-            if (
-                pkg not in packages.keys()
-            ):  # check if pkg key has already been initialized, due to some packages stating their dependencies multiple times (i.e. 'argon2-cffi')
-                packages[pkg] = {
-                    "version_constraints": pkg_vcon,
-                    "markers": {},
-                    "extras": [],
-                }
-            if (
-                not pkgq
-            ):  # if the dependency has no markers, then no additional parsing is needed
+            try:
+                _req = parse_requirement(req)
+                atoms = _marker_atoms(_req.marker) if _req.marker else ()
+                # some packages state their dependencies multiple times (i.e. 'argon2-cffi'),
+                # with different constraints for different environments; the first one that applies wins
+                applies = _req.key not in packages and _requirement_applies(
+                    _req.marker, extras, disregard_extras, disregard_markers, environment
+                )
+            except (InvalidRequirement, InvalidMarker) as err:
+                # i.e. pre-PEP 508 metadata such as 'foo (1.0)'; don't let it hide every other dependency
+                warn(f"Skipping unparsable dependency {req!r}: {err}", stacklevel=2)
                 continue
-            for constraint in pkgq:
-                _c = constraint.strip().split(" or ")
-                c = []
-                if len(_c) == 1:
-                    c = [re.sub(r'[()\s"\']', "", constraint.strip())]
-                else:
-                    for i in _c:
-                        c.append(re.sub(r'[()\s"\']', "", i.strip()))
-
-                _m = []
-                for i in c:
-                    _m.append(re.match(r"(\w+)([!=<>]+)(\S+)", i))
-
-                for m in _m:
-                    if m.group(1) in ["python_version", "python_full_version", "implementation_version"]:  # type: ignore
-                        packages[pkg]["markers"][m.group(1)] = m.group(2) + m.group(3)  # type: ignore
-                        continue
-                    if m.group(1) == "extra":  # type: ignore
-                        packages[pkg]["extras"].append(m.group(3))  # type: ignore
-                        continue
-                    packages[pkg]["markers"][m.group(1)] = m.group(3)  # type: ignore
-
-        # extra checker
-        if not disregard_extras:
-            for k, v in packages.copy().items():
-                hitcount = 0
-                if v.get("extras"):
-                    for extra in v["extras"]:
-                        root_extras.add(extra)
-                        if extra not in extras:
-                            hitcount += 1
-                            if hitcount == len(v["extras"]):
-                                try:
-                                    packages.pop(k)
-                                except KeyError:
-                                    continue
-
-        # environment marker checker
-        if not disregard_markers:
-            # dictionary holding each package, with info on whether or not
-            # every marker constraint is met for a given package
-            _pkg_wmarks: dict = {}
-            for k in packages:
-                _pkg_wmarks[k] = []
-            for k, v in packages.copy().items():
-                for _k, _v in v["markers"].items():
-                    # seperate if condition for python_version-like markers
-                    # uses Version.fits_constraints() method to confirm constraint(s)
-                    if _k in [
-                        "python_version",
-                        "python_full_version",
-                        "implementation_version",
-                    ]:
-                        if DEPENDENCY_ENVIRONMENT_MARKERS[_k].fits_constraints(
-                            re.sub("[)(]", "", _v).split(",")
-                        ):
-                            _pkg_wmarks[k].append(True)
-                        else:
-                            _pkg_wmarks[k].append(False)
-                    # regular if condition for all other markers
-                    elif _v == DEPENDENCY_ENVIRONMENT_MARKERS[_k]:
-                        _pkg_wmarks[k].append(True)
-                    else:
-                        _pkg_wmarks[k].append(False)
-            for k, v in _pkg_wmarks.items():
-                if not all(v):
-                    packages.pop(k)
+            _extras = [value for var, _, value in atoms if var == "extra"]
+            root_extras.update(_extras)
+            if not applies:
+                continue
+            markers: Dict[str, str] = {}
+            for var, op, value in atoms:
+                if var in _VERSION_MARKERS:
+                    _prev = markers.get(var)
+                    markers[var] = f"{_prev},{op}{value}" if _prev else op + value
+                elif var != "extra":
+                    markers[var] = value
+            packages[_req.key] = {
+                "version_constraints": _req.specifier or None,
+                "markers": markers,
+                "extras": _extras,
+            }
 
         return packages, tuple(root_extras)
 
 
+def _requirement_applies(
+    marker: Optional[str],
+    extras: list,
+    disregard_extras: bool,
+    disregard_markers: bool,
+    environment: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """:raises InvalidMarker: if ``marker`` is not a valid environment marker"""
+    if not marker:
+        return True
+    return compile_marker(marker).evaluate(
+        environment,
+        extras=extras,
+        ignore_extras=disregard_extras,
+        ignore_environment=disregard_markers,
+    )
+
+
+_VERSION_MARKERS = frozenset(
+    ("python_version", "python_full_version", "implementation_version")
+)
+_MARKER_ATOM_REGEX = re.compile(
+    r"""(\w+)\s*(===|==|!=|<=|>=|~=|<|>|not\s+in|in)\s*(?:"([^"]*)"|'([^']*)')"""
+)
+
+
+@lru_cache(maxsize=4096)
+def _marker_atoms(marker: str) -> Tuple[Tuple[str, str, str], ...]:
+    """Flatten a marker expression into its ``(variable, operator, value)`` comparisons."""
+    return tuple(
+        (m.group(1), m.group(2), m.group(3) if m.group(3) is not None else m.group(4))
+        for m in _MARKER_ATOM_REGEX.finditer(marker)
+    )
+
+
 class URLReleaseObject(NamedTuple):
     """
     Object containing information about a specific release of a PyPI package. Data taken from either the 'urls' or 'releases' API response keys. Should not be directly called.
@@ -387,8 +473,8 @@ class URLReleaseObject(NamedTuple):
     :param size: File size, in bytes
     :type size: int
 
-    :param upload_time: Datetime object for when release was uploaded to PyPI
-    :type upload_time: :class:`datetime.datetime`
+    :param upload_time: Datetime object (UTC) for when release was uploaded to PyPI, or seconds since the Unix epoch if built with ``raw_timestamps``
+    :type upload_time: Union[:class:`datetime.datetime`, int]
 
     :param url: Package release's download URL
     :type url: str
@@ -409,13 +495,23 @@ class URLReleaseObject(NamedTuple):
     packagetype: str
     python_version: str
     size: int
-    upload_time: datetime.datetime
+    upload_time: Union[datetime.datetime, int]
     url: str
     yanked: bool
     yanked_reason: Optional[str]
 
     @classmethod
-    def construct(cls, url_release_item: Dict[str, Any]):
+    def construct(cls, url_release_item: Dict[str, Any], raw_timestamps: bool = False):
+        """
+        Build from an item of the 'urls' or 'releases' API response keys.
+
+        :param raw_timestamps: Keep ``upload_time`` as seconds since the Unix epoch instead of building a datetime (Default: False)
+        :type raw_timestamps: bool
+
+        .. versionchanged:: 1.1.0
+            Added ``raw_timestamps``.
+        """
+        upload_time = url_release_item.get("upload_time") or url_release_item["upload_time_iso_8601"]
         return cls(
             url_release_item["comment_text"],
             SimpleNamespace(**url_release_item["digests"]),
@@ -426,14 +522,7 @@ class URLReleaseObject(NamedTuple):
             url_release_item["packagetype"],
             url_release_item["python_version"],
             url_release_item["size"],
-            datetime.datetime(
-                *time.strptime(
-                    url_release_item.get(
-                        "upload_time", url_release_item["upload_time_iso_8601"]
-                    ),
-                    "%Y-%m-%dT%H:%M:%S",
-                )[:6]
-            ),
+            _upload_timestamp(upload_time) if raw_timestamps else _parse_upload_time(upload_time),
             url_release_item["url"],
             url_release_item["yanked"],
             url_release_item["yanked_reason"] or None,
@@ -500,45 +589,109 @@ class PackageObject(_PackageBase):
     :param disregard_markers: Whether or not the dependency parser should care about environment markers (excluding extras) when parsing (Default: False)
     :type disregard_markers: bool
 
+    :param session: HTTP session used for any requests made by this object and its dependencies (optional)
+    :type session: :class:`~otlet.session.Session`
+
+    :param http_response: JSON-parsed HTTP Response to be used to populate object, instead of performing a request (optional)
+    :type http_response: Dict[str, Any]
+
+    :param skip_releases: Don't decode the 'releases' section of the response, leaving ``releases`` empty; always the case when ``release`` is given (Default: False)
+    :type skip_releases: bool
+
+    :param raw_timestamps: Keep the ``upload_time`` of release files as seconds since the Unix epoch instead of datetime objects (Default: False)
+    :type raw_timestamps: bool
+
     :var info: Info about a given package version
     :vartype info: :class:`~PackageInfoObject`
 
     :var last_serial: The most recent serial ID number for the package.
     :vartype last_serial: int
 
-    :var releases: Dictionary containing all release objects for a given package
-    :vartype releases: Dict[str, :class:`~URLReleaseObject`]
+    :var releases: Mapping containing all release objects for a given package
+    :vartype releases: :class:`~otlet.releases.ReleaseTable`
 
     :var urls: List of package releases for the given version
     :vartype urls: List[:class:`~URLReleaseObject`]
 
+    :var version_index: Sorted index of ``releases``, for finding the highest version satisfying some constraints
+    :vartype version_index: :class:`~otlet.releases.VersionIndex`
+
     :var vulnerabilities: List of objects containing vulnerability details for the given version, if applicable.
     :vartype vulnerabilities: Optional[List[:class:`~PackageVulnerabilitiesObject`]]
 
     .. versionchanged:: 1.0.0
         Converted from dataclass into callable object.
+
+    .. versionchanged:: 1.1.0
+        ``info``, ``releases``, ``urls`` and ``vulnerabilities`` are built from the response on first access.
     """
 
     def __init__(
-        self, package_name: str, release: Optional[str] = None, **kwargs
+        self,
+        package_name: str,
+        release: Optional[str] = None,
+        session: Optional[Session] = None,
+        http_response: Optional[Dict[str, Any]] = None,
+        skip_releases: bool = False,
+        raw_timestamps: bool = False,
+        **kwargs,
     ) -> None:
-        super().__init__(package_name, release)
-        self.info = PackageInfoObject(
-            package_name, self.extras, release, False, self.http_response, **kwargs
-        )
+        super().__init__(package_name, release, session, http_response, skip_releases)
+        self._raw_timestamps = raw_timestamps
+        self._info_kwargs = kwargs
         self.last_serial = self.http_response["last_serial"]
-        self.releases = {}
-        self.urls = [URLReleaseObject.construct(_) for _ in self.http_response["urls"]]
-        self.vulnerabilities = [
+
+    @_cached_property
+    def info(self) -> PackageInfoObject:
+        return PackageInfoObject(
+            self.name,
+            self.extras,
+            self.release,
+            False,
+            self.http_response,
+            session=self.session,
+            **self._info_kwargs,
+        )
+
+    @_cached_property
+    def releases(self) -> "ReleaseTable":
+        from .releases import ReleaseTable, VersionIndex  # releases imports this module
+
+        return ReleaseTable(
+            {} if self._skip_releases else self.http_response["releases"],
+            self._raw_timestamps,
+        )
+
+    @_cached_property
+    def version_index(self) -> "VersionIndex":
+        from .releases import VersionIndex  # releases imports this module
+
+        return VersionIndex(self.releases)
+
+    @_cached_property
+    def urls(self) -> List[URLReleaseObject]:
+        return [
+            URLReleaseObject.construct(_, self._raw_timestamps)
+            for _ in self.http_response["urls"]
+        ]
+
+    @_cached_property
+    def vulnerabilities(self) -> Optional[List[PackageVulnerabilitiesObject]]:
+        return [
             PackageVulnerabilitiesObject.construct(_)
             for _ in self.http_response["vulnerabilities"]
         ] or None
 
-        if not release:
-            for k, v in self.http_response["releases"].items():
-                if not v:
-                    continue
-                self.releases[k] = URLReleaseObject.construct(v[0])
+    def dependencies_for_environments(
+        self, environments: List[Dict[str, Any]]
+    ) -> List[Optional[List["PackageDependencyObject"]]]:
+        """
+        Dependencies of the package in each of several environments.
+        See :meth:`PackageInfoObject.dependencies_for_environments`.
+
+        .. versionadded:: 1.1.0
+        """
+        return self.info.dependencies_for_environments(environments)  # type: ignore
 
     def populate_dependencies(self, depth=0) -> None:
         """Populate all dependencies for the package."""
@@ -547,9 +700,7 @@ class PackageObject(_PackageBase):
 
     @property
     def canonicalized_name(self) -> str:
-        return (
-            re.compile(r"[-_.]+").sub("-", self.info.name).lower()
-        )  # stolen from packaging module
+        return canonicalize_name(self.info.name)  # type: ignore
 
     @property
     def version(self) -> str:
@@ -595,6 +746,9 @@ class PackageDependencyObject(PackageObject):
     :var is_populated: Boolean value stating whether or not the object has been populated with info from PyPI
     :vartype is_populated: bool
 
+    :var session: HTTP session used when populating the object
+    :vartype session: :class:`~otlet.session.Session`
+
     .. versionadded:: 1.0.0
     """
 
@@ -604,6 +758,7 @@ class PackageDependencyObject(PackageObject):
         version_constraints: Optional[str] = None,
         markers: Optional[dict] = None,
         extras: Optional[list] = None,
+        session: Optional[Session] = None,
     ) -> None:
         self.name = package_name
         self.version_constraints = (
@@ -613,6 +768,7 @@ class PackageDependencyObject(PackageObject):
         )
         self.markers = markers
         self.requires_extras = extras
+        self.session = session or get_default_session()
         self.is_populated = False
 
     def __repr__(self) -> str:
@@ -621,25 +777,43 @@ class PackageDependencyObject(PackageObject):
     def populate(self, recursion_depth=0) -> None:
         """Populate the object with package information from PyPI."""
         if not self.is_populated:
-            super().__init__(self.name, self.get_latest_possible_version())
-            self.is_populated = True
+            # reuse an already-parsed object for this exact release if there is one,
+            # which also shares its (possibly populated) dependency objects
+            version = self.get_latest_possible_version()
+            self._populate_from(
+                get_default_memo().get(
+                    self.name, str(version) if version else None, self.session
+                )
+            )
         if recursion_depth:
             if self.dependencies:
                 for j in self.dependencies:
                     j.populate(recursion_depth - 1)
 
-    def get_latest_possible_version(self, allow_pre=False) -> Optional[Version]:
+    def _populate_from(self, package: PackageObject) -> None:
+        # build the info object before copying, so its dependency objects are shared with `package`
+        package.info
+        _session = self.session
+        self.__dict__.update(package.__dict__)
+        self.session = _session
+        self.is_populated = True
+
+    def get_latest_possible_version(
+        self, allow_pre=False, allow_yanked=True
+    ) -> Optional[Version]:
         """Fetches the maximum allowable version that fits within self.version_constraints, or None if no possible version is available."""
-        _j = PackageObject(self.name)
-        for i in reversed(list(_j.releases.keys())):
-            _i = parse_version(i)
-            if not self.version_constraints:
-                return _i
-            if _i.fits_constraints(self.version_constraints) and not (
-                not allow_pre and _i.is_prerelease
-            ):
-                return _i
-        return None
+        return self._select_version(
+            get_default_memo().get(self.name, session=self.session),
+            allow_pre,
+            allow_yanked,
+        )
+
+    def _select_version(
+        self, package: PackageObject, allow_pre=False, allow_yanked=True
+    ) -> Optional[Version]:
+        return package.version_index.latest(  # type: ignore
+            self.version_constraints, allow_pre, allow_yanked
+        )
 
     @property
     def canonicalized_name(self) -> str:
@@ -0,0 +1,116 @@
+"""
+otlet.bulk
+======================
+Fetching many packages at once over a bounded thread pool.
+"""
+#
+# Copyright (c) 2022 Noah Tanner
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+from .api import PackageObject
+from .session import Session
+
+
+class FetchResult(NamedTuple):
+    """
+    Outcome of fetching a single package with :func:`fetch_many`.
+
+    :param name: Package name, as requested (including any extras)
+    :type name: str
+
+    :param release: Requested release, if any
+    :type release: Optional[str]
+
+    :param package: The fetched package, or None if fetching it failed
+    :type package: Optional[:class:`~otlet.api.PackageObject`]
+
+    :param error: The exception raised while fetching the package, if any
+    :type error: Optional[BaseException]
+
+    .. versionadded:: 1.1.0
+    """
+
+    name: str
+    release: Optional[str]
+    package: Optional[PackageObject]
+    error: Optional[BaseException]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _fetch_one(name: str, release: Optional[str], session: Session, kwargs) -> FetchResult:
+    try:
+        return FetchResult(name, release, PackageObject(name, release, session, **kwargs), None)
+    except Exception as err:
+        return FetchResult(name, release, None, err)
+
+
+def fetch_many(
+    packages: Iterable[Union[str, Tuple[str, Optional[str]]]],
+    max_workers: int = 8,
+    ordered: bool = False,
+    session: Optional[Session] = None,
+    **kwargs,
+) -> Iterator[FetchResult]:
+    """
+    Fetch many packages concurrently, yielding a :class:`FetchResult` for each one.
+
+    A failure to fetch one package (i.e. :class:`~otlet.exceptions.PyPIPackageNotFound`) is
+    reported on its result instead of aborting the whole batch.
+
+    :param packages: Package names (optionally with extras, i.e. ``"name[extra]"``), or ``(name, release)`` tuples
+    :type packages: Iterable[Union[str, Tuple[str, Optional[str]]]]
+
+    :param max_workers: Number of packages fetched at the same time (Default: 8)
+    :type max_workers: int
+
+    :param ordered: Yield results in input order, instead of as they finish (Default: False)
+    :type ordered: bool
+
+    :param session: HTTP session shared by all workers; one sized to ``max_workers`` is used if not given (optional)
+    :type session: :class:`~otlet.session.Session`
+
+    Any other keyword arguments (i.e. ``disregard_extras``) are passed on to :class:`~otlet.api.PackageObject`.
+
+    .. versionadded:: 1.1.0
+    """
+    _session = session or Session(max_connections=max_workers)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = []
+        for item in packages:
+            name, release = (item, None) if isinstance(item, str) else item
+            futures.append(executor.submit(_fetch_one, name, release, _session, kwargs))
+        for future in futures if ordered else as_completed(futures):
+            yield future.result()
+    finally:
+        # the caller may stop iterating early, so don't start anything that hasn't started yet
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+        if session is None:
+            _session.close()
+
+
+__all__ = ["FetchResult", "fetch_many"]
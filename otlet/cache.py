@@ -0,0 +1,275 @@
+"""
+otlet.cache
+======================
+Opt-in on-disk cache for PyPI JSON API responses.
+"""
+#
+# Copyright (c) 2022 Noah Tanner
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+import os
+import json
+import time
+import hashlib
+import re
+import threading
+from typing import Dict, List, NamedTuple, Optional
+from .util import _atomic_write
+
+_META_SUFFIX = ".meta"
+_PREFIX = re.compile(r"^[0-9a-f]{2}$")
+_ENTRY = re.compile(r"^([0-9a-f]{64})(?:\.meta)?$")
+
+
+class CacheEntry(NamedTuple):
+    """
+    A single cached response. Should not be directly called.
+
+    :param url: URL the response was fetched from
+    :type url: str
+
+    :param body: Raw response body
+    :type body: bytes
+
+    :param stored_at: Unix timestamp of when the entry was last fetched or revalidated
+    :type stored_at: float
+
+    :param etag: Value of the response's 'ETag' header, if any
+    :type etag: Optional[str]
+
+    :param last_modified: Value of the response's 'Last-Modified' header, if any
+    :type last_modified: Optional[str]
+
+    :param last_serial: Value of the response's 'X-PyPI-Last-Serial' header, if any
+    :type last_serial: Optional[int]
+
+    .. versionadded:: 1.1.0
+    """
+
+    url: str
+    body: bytes
+    stored_at: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+    last_serial: Optional[int]
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers needed to revalidate this entry with a conditional GET."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    On-disk cache of raw PyPI responses, consulted by :class:`~otlet.session.Session` when given one.
+
+    Entries younger than ``ttl`` are served without touching the network. Older entries are
+    revalidated with a conditional GET, so an unchanged package costs a body-less 304 instead
+    of a full download. Every write goes through an atomic rename, which makes it safe for
+    several processes to share one cache directory.
+
+    :param directory: Directory to store cached responses in (created if missing)
+    :type directory: str
+
+    :param ttl: Seconds an entry is served without revalidation (Default: 3600)
+    :type ttl: float
+
+    :param max_age: Seconds after which an entry that hasn't been used is evicted (Default: 7 days)
+    :type max_age: float
+
+    :param max_size: Maximum total size of the cache, in bytes (Default: 512 MiB)
+    :type max_size: int
+
+    .. versionadded:: 1.1.0
+    """
+
+    #: Number of writes between automatic calls to :meth:`prune`
+    PRUNE_INTERVAL = 64
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: float = 3600,
+        max_age: float = 7 * 24 * 3600,
+        max_size: int = 512 * 1024 * 1024,
+    ) -> None:
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_size = max_size
+        self._writes = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Return the cached entry for ``url``, or None if there isn't a (readable) one."""
+        path = self._path(url)
+        try:
+            with open(path + _META_SUFFIX, "rb") as f:
+                meta = json.loads(f.read())
+            with open(path, "rb") as f:
+                body = f.read()
+            os.utime(path)  # mark as recently used for size-based eviction
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or len(body) != meta.get("size"):
+            return None  # hash collision, or a body and metadata from different writes
+        return CacheEntry(
+            url,
+            body,
+            meta["stored_at"],
+            meta.get("etag"),
+            meta.get("last_modified"),
+            meta.get("last_serial"),
+        )
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.age < self.ttl
+
+    def _write_meta(self, path: str, entry: CacheEntry) -> None:
+        meta = {
+            "url": entry.url,
+            "size": len(entry.body),
+            "stored_at": entry.stored_at,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "last_serial": entry.last_serial,
+        }
+        _atomic_write(path + _META_SUFFIX, json.dumps(meta).encode())
+
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        last_serial: Optional[int] = None,
+    ) -> CacheEntry:
+        """Write a response body to the cache, replacing any previous entry for ``url``."""
+        entry = CacheEntry(url, body, time.time(), etag, last_modified, last_serial)
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # body first, so a reader never pairs the new metadata with the previous body
+        _atomic_write(path, body)
+        self._write_meta(path, entry)
+
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.PRUNE_INTERVAL == 0
+        if prune:
+            self.prune()
+        return entry
+
+    def refresh(self, entry: CacheEntry) -> CacheEntry:
+        """Mark ``entry`` as freshly revalidated (i.e. after a 304 response), rewriting only its metadata."""
+        entry = entry._replace(stored_at=time.time())
+        path = self._path(entry.url)
+        try:
+            self._write_meta(path, entry)
+        except FileNotFoundError:
+            return self.store(
+                entry.url, entry.body, entry.etag, entry.last_modified, entry.last_serial
+            )  # evicted since it was read
+        return entry
+
+    def delete(self, url: str) -> None:
+        path = self._path(url)
+        _unlink(path)
+        _unlink(path + _META_SUFFIX)
+
+    def _files(self):
+        # only files this cache wrote: <2 hex chars>/<sha256 hex>[.meta], and leftover temporary files
+        for prefix in os.listdir(self.directory):
+            subdir = os.path.join(self.directory, prefix)
+            if not _PREFIX.match(prefix) or not os.path.isdir(subdir):
+                continue
+            for name in os.listdir(subdir):
+                if name.startswith(".tmp-"):
+                    yield os.path.join(subdir, name), None
+                    continue
+                match = _ENTRY.match(name)
+                if match and match.group(1).startswith(prefix):
+                    yield os.path.join(subdir, name), match.group(1)
+
+    def prune(self) -> None:
+        """Evict entries unused for longer than ``max_age``, then the least recently used ones until under ``max_size``."""
+        now = time.time()
+        entries: Dict[str, List] = {}  # key -> [last used, total size, body path]
+        for path, key in self._files():
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue  # removed by another process
+            if key is None:
+                # leftover from a crashed writer; give live writers an hour
+                if now - st.st_mtime > 3600:
+                    _unlink(path)
+                continue
+            body_path = os.path.join(os.path.dirname(path), key)
+            entry = entries.setdefault(key, [0.0, 0, body_path])
+            if path == body_path:
+                entry[0] = st.st_mtime
+            entry[1] += st.st_size
+
+        total = 0
+        candidates = []
+        for used, size, path in entries.values():
+            if now - used > self.max_age:
+                _unlink(path)
+                _unlink(path + _META_SUFFIX)
+                continue
+            total += size
+            candidates.append((used, size, path))
+        if total <= self.max_size:
+            return
+        candidates.sort()
+        for _, size, path in candidates:
+            _unlink(path)
+            _unlink(path + _META_SUFFIX)
+            total -= size
+            if total <= self.max_size:
+                break
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        for path, _ in list(self._files()):
+            _unlink(path)
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+__all__ = ["CacheEntry", "ResponseCache"]
@@ -38,6 +38,27 @@ class NotPopulatedError(OtletError):
         )
 
 
+class InvalidRequirement(OtletError):
+    """Raised when a dependency specifier can't be parsed as per PEP 508."""
+
+    def __init__(self, requirement: str) -> None:
+        super().__init__(f"Invalid requirement: '{requirement}'")
+
+
+class InvalidMarker(OtletError):
+    """Raised when an environment marker can't be parsed or evaluated as per PEP 508."""
+
+    def __init__(self, marker: str, reason: str = "Invalid marker") -> None:
+        super().__init__(f"{reason}: '{marker}'")
+
+
+class InvalidWheelFilename(OtletError):
+    """Raised when a wheel filename can't be parsed as per PEP 427."""
+
+    def __init__(self, filename: str) -> None:
+        super().__init__(f"Invalid wheel filename: '{filename}'")
+
+
 class PyPIAPIError(Exception):
     """Base class for all PyPI-related exceptions."""
 
@@ -72,6 +93,9 @@ class PyPIPackageVersionNotFound(PyPIAPIError):
 __all__ = [
     "OtletError",
     "NotPopulatedError",
+    "InvalidRequirement",
+    "InvalidMarker",
+    "InvalidWheelFilename",
     "PyPIAPIError",
     "PyPIServiceDown",
     "PyPIPackageNotFound",
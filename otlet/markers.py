@@ -1,7 +1,13 @@
 import os
+import re
+import operator
 import sys
 import platform
-from .packaging.version import parse
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Mapping, Optional, Tuple
+from .exceptions import InvalidMarker
+from .packaging.specifiers import InvalidSpecifier, parse_specifier
+from .packaging.version import Version, InvalidVersion, parse
 
 # 'implementation_version' impl as per PEP 508
 def _format_full_version(info):
@@ -33,4 +39,253 @@ DEPENDENCY_ENVIRONMENT_MARKERS = {
     "implementation_version": parse(_IMPL_VER),
 }
 
-__all__ = ["DEPENDENCY_ENVIRONMENT_MARKERS"]
+_MARKER_TOKEN_REGEX = re.compile(
+    r"""
+    \s*(?:
+        (?P<paren>[()])
+        | (?P<op>===|==|!=|<=|>=|~=|<|>|not\s+in\b|in\b)
+        | (?P<bool>and\b|or\b)
+        | "(?P<dstr>[^"]*)"
+        | '(?P<sstr>[^']*)'
+        | (?P<var>[A-Za-z_][A-Za-z0-9_.]*)
+    )
+    """,
+    re.VERBOSE,
+)
+_VERSION_OPERATORS = frozenset(("===", "==", "!=", "<=", ">=", "~=", "<", ">"))
+_MAX_CACHED_RESULTS = 64
+# pre-PEP 508 spellings of marker variables, still found in some metadata
+_LEGACY_MARKER_NAMES = {
+    "os.name": "os_name",
+    "sys.platform": "sys_platform",
+    "platform.version": "platform_version",
+    "platform.machine": "platform_machine",
+    "platform.python_implementation": "platform_python_implementation",
+    "python_implementation": "platform_python_implementation",
+}
+
+# marker leaf: (environment, extras, ignore_extras, ignore_environment) -> bool
+_Evaluator = Callable[[Mapping[str, Any], FrozenSet[str], bool, bool], bool]
+
+
+def _normalize_extra(extra: str) -> str:
+    return re.sub(r"[-_.]+", "-", extra).lower()
+
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+# comparisons are shared by every marker and environment that makes them,
+# i.e. 'python_version >= "3.7"' is only worked out once per distinct python_version
+@lru_cache(maxsize=4096)
+def _compare(lhs: Any, op: str, rhs: Any) -> bool:
+    if op in _VERSION_OPERATORS:
+        # PEP 440 comparison when both sides are versions, python string comparison otherwise
+        try:
+            return parse_specifier(op + str(rhs)).contains(
+                lhs if isinstance(lhs, Version) else Version(str(lhs))
+            )
+        except (InvalidSpecifier, InvalidVersion):
+            pass
+    lhs, rhs = str(lhs), str(rhs)
+    if op == "in":
+        return lhs in rhs
+    if op == "not in":
+        return lhs not in rhs
+    if op in _OPERATORS:
+        return _OPERATORS[op](lhs, rhs)
+    raise InvalidMarker(f"{lhs} {op} {rhs}", "Unsupported comparison")
+
+
+class _MarkerParser:
+    """Recursive-descent parser turning a marker expression into nested evaluator closures."""
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.tokens: List[Tuple[str, str]] = []
+        pos = 0
+        while pos < len(expression):
+            if expression[pos:].isspace():
+                break
+            m = _MARKER_TOKEN_REGEX.match(expression, pos)
+            if not m or m.end() == pos:
+                raise InvalidMarker(expression)
+            kind = m.lastgroup
+            value = m.group(kind)  # type: ignore
+            if kind in ("dstr", "sstr"):
+                kind = "str"
+            elif kind == "op":
+                value = " ".join(value.split())
+            self.tokens.append((kind, value))  # type: ignore
+            pos = m.end()
+        self.pos = 0
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _next(self, kind: str) -> str:
+        tok = self._peek()
+        if tok is None or tok[0] != kind:
+            raise InvalidMarker(self.expression)
+        self.pos += 1
+        return tok[1]
+
+    def parse(self) -> _Evaluator:
+        func = self._or()
+        if self.pos != len(self.tokens):
+            raise InvalidMarker(self.expression)
+        return func
+
+    def _or(self) -> _Evaluator:
+        funcs = [self._and()]
+        while self._peek() == ("bool", "or"):
+            self.pos += 1
+            funcs.append(self._and())
+        if len(funcs) == 1:
+            return funcs[0]
+        return lambda env, ex, ie, iv: any(f(env, ex, ie, iv) for f in funcs)
+
+    def _and(self) -> _Evaluator:
+        funcs = [self._expr()]
+        while self._peek() == ("bool", "and"):
+            self.pos += 1
+            funcs.append(self._expr())
+        if len(funcs) == 1:
+            return funcs[0]
+        return lambda env, ex, ie, iv: all(f(env, ex, ie, iv) for f in funcs)
+
+    def _expr(self) -> _Evaluator:
+        if self._peek() == ("paren", "("):
+            self.pos += 1
+            func = self._or()
+            self._next("paren")
+            return func
+        lhs = self._operand()
+        op = self._next("op")
+        rhs = self._operand()
+        return self._leaf(lhs, op, rhs)
+
+    def _operand(self) -> Tuple[str, str]:
+        tok = self._peek()
+        if tok is None or tok[0] not in ("str", "var"):
+            raise InvalidMarker(self.expression)
+        self.pos += 1
+        if tok[0] == "var":
+            return ("var", _LEGACY_MARKER_NAMES.get(tok[1], tok[1]))
+        return tok
+
+    def _leaf(self, lhs: Tuple[str, str], op: str, rhs: Tuple[str, str]) -> _Evaluator:
+        if ("var", "extra") in (lhs, rhs):
+            other = _normalize_extra(rhs[1] if lhs == ("var", "extra") else lhs[1])
+            if op == "==":
+                func = lambda env, ex, ie, iv: ie or other in ex  # noqa: E731
+            elif op == "!=":
+                func = lambda env, ex, ie, iv: ie or other not in ex  # noqa: E731
+            else:
+                raise InvalidMarker(self.expression)
+        else:
+
+            def func(env, ex, ie, iv):
+                if iv:
+                    return True
+                _lhs = env[lhs[1]] if lhs[0] == "var" else lhs[1]
+                _rhs = env[rhs[1]] if rhs[0] == "var" else rhs[1]
+                return _compare(_lhs, op, _rhs)
+
+        return func
+
+
+class Marker:
+    """
+    A compiled PEP 508 environment marker. Use :func:`compile_marker` rather than calling this directly,
+    so that identical marker strings share one compiled object and its cached results.
+
+    .. versionadded:: 1.1.0
+    """
+
+    __slots__ = ("expression", "_func", "_results")
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self._func = _MarkerParser(expression).parse()
+        self._results: Dict[Hashable, bool] = {}
+
+    def __repr__(self) -> str:
+        return f"<Marker('{self.expression}')>"
+
+    def __str__(self) -> str:
+        return self.expression
+
+    def evaluate(
+        self,
+        environment: Optional[Mapping[str, Any]] = None,
+        extras: Optional[Any] = None,
+        ignore_extras: bool = False,
+        ignore_environment: bool = False,
+    ) -> bool:
+        """
+        Evaluate the marker.
+
+        :param environment: Environment marker values to evaluate against; any left out take their value
+            from :data:`DEPENDENCY_ENVIRONMENT_MARKERS` (Default: :data:`DEPENDENCY_ENVIRONMENT_MARKERS`)
+        :type environment: Optional[Mapping[str, Any]]
+
+        :param extras: Extras the requirement is being installed with, compared against the ``extra`` marker
+        :type extras: Optional[Iterable[str]]
+
+        :param ignore_extras: Treat every ``extra`` comparison as satisfied
+        :type ignore_extras: bool
+
+        :param ignore_environment: Treat every comparison other than ``extra`` as satisfied
+        :type ignore_environment: bool
+        """
+        _extras = frozenset(_normalize_extra(e) for e in extras or ())
+        if environment is None or environment is DEPENDENCY_ENVIRONMENT_MARKERS:
+            environment, env_key = DEPENDENCY_ENVIRONMENT_MARKERS, None
+        else:
+            if not isinstance(environment, _Environment):
+                environment = _Environment(environment)
+            env_key = environment.key
+        key = (env_key, _extras, ignore_extras, ignore_environment)
+        result = self._results.get(key)
+        if result is None:
+            try:
+                result = self._func(environment, _extras, ignore_extras, ignore_environment)
+            except KeyError as err:
+                raise InvalidMarker(self.expression, f"Unknown environment marker {err}") from None
+            if len(self._results) >= _MAX_CACHED_RESULTS:
+                self._results.clear()
+            self._results[key] = result
+        return result
+
+
+class _Environment(dict):
+    """Environment marker values with a precomputed cache key, for evaluating many markers against one environment."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, environment: Mapping[str, Any]) -> None:
+        super().__init__(DEPENDENCY_ENVIRONMENT_MARKERS)
+        self.update(environment)
+        self.key = tuple(sorted((k, str(v)) for k, v in self.items()))
+
+
+@lru_cache(maxsize=4096)
+def compile_marker(expression: str) -> Marker:
+    """
+    Compile a PEP 508 environment marker expression, i.e. ``'python_version < "3.8" and os_name == "posix"'``.
+    Compiled markers are cached by string, so each distinct marker is only parsed once.
+
+    :raises InvalidMarker: if ``expression`` is not a valid marker
+    """
+    return Marker(expression)
+
+
+__all__ = ["DEPENDENCY_ENVIRONMENT_MARKERS", "Marker", "compile_marker"]
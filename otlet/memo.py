@@ -0,0 +1,184 @@
+"""
+otlet.memo
+======================
+Bounded in-process memo of parsed package objects.
+"""
+#
+# Copyright (c) 2022 Noah Tanner
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+import re
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+from .session import PYPI_URL
+
+_canonicalize_regex = re.compile(r"[-_.]+")
+_extras_regex = re.compile(r"[\[\]]")
+# PackageObject arguments that change the parsed object, and so are part of its memo key
+_KEY_ARGUMENTS = ("disregard_extras", "disregard_markers", "skip_releases", "raw_timestamps")
+
+
+def canonicalize_name(name: str) -> str:
+    """Normalize a project name as per PEP 503."""
+    return _canonicalize_regex.sub("-", name).lower()
+
+
+class PackageMemo:
+    """
+    Thread-safe, bounded LRU memo of :class:`~otlet.api.PackageObject` instances, keyed by
+    canonicalized package name, release, extras, the flags that change how a package is parsed
+    (``disregard_extras``, ``disregard_markers``, ``skip_releases`` and ``raw_timestamps``) and the
+    source it was fetched from (see :meth:`source_key`).
+
+    :param maxsize: Maximum number of objects kept; ``0`` disables memoization (Default: 256)
+    :type maxsize: int
+
+    :param ttl: Seconds an object is kept before it is fetched again, or None to keep it until evicted (Default: None)
+    :type ttl: Optional[float]
+
+    :var hits: Number of lookups answered from the memo
+    :vartype hits: int
+
+    :var misses: Number of lookups that had to construct a new object
+    :vartype misses: int
+
+    .. versionadded:: 1.1.0
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()  # key -> (object, expiry)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"<PackageMemo size={len(self)}/{self.maxsize} hits={self.hits} misses={self.misses}>"
+
+    @staticmethod
+    def source_key(session: Any = None) -> Hashable:
+        """
+        Where a session gets its responses from: its ``source_key`` attribute (i.e. PyPI's URL for a
+        :class:`~otlet.session.Session`, or the path of a :class:`~otlet.mirror.MirrorSource`), or the
+        session's identity if it has none. Without a session, the default session's source (PyPI).
+        """
+        if session is None:
+            return PYPI_URL
+        return getattr(session, "source_key", None) or id(session)
+
+    @classmethod
+    def make_key(
+        cls,
+        package_name: str,
+        release: Optional[str] = None,
+        disregard_extras: bool = False,
+        disregard_markers: bool = False,
+        skip_releases: bool = False,
+        raw_timestamps: bool = False,
+        session: Any = None,
+    ) -> Tuple[str, Optional[str], Tuple[str, ...], bool, bool, bool, bool, Hashable]:
+        _parsed = _extras_regex.sub(",", package_name).strip(",").split(",")
+        extras = tuple(sorted(e.strip() for e in _parsed[1:] if e.strip()))
+        return (
+            canonicalize_name(_parsed[0].strip()),
+            str(release) if release is not None else None,
+            extras,
+            bool(disregard_extras),
+            bool(disregard_markers),
+            bool(skip_releases),
+            bool(raw_timestamps),
+            cls.source_key(session),
+        )
+
+    @staticmethod
+    def key_arguments(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """The keyword arguments of a :class:`~otlet.api.PackageObject` that are part of its key (see :meth:`make_key`)."""
+        return {k: v for k, v in kwargs.items() if k in _KEY_ARGUMENTS}
+
+    def get(self, package_name: str, release: Optional[str] = None, session=None, **kwargs):
+        """Return a memoized :class:`~otlet.api.PackageObject`, constructing (and storing) it on a miss."""
+        from .api import PackageObject  # api uses the memo itself
+
+        key = self.make_key(package_name, release, session=session, **self.key_arguments(kwargs))
+        obj = self.lookup(key)
+        if obj is None:
+            obj = self.add(key, PackageObject(package_name, release, session, **kwargs))
+        return obj
+
+    def lookup(self, key: Hashable) -> Optional[Any]:
+        """Return the object stored under ``key`` (see :meth:`make_key`), or None, counting a hit or miss."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._data[key]  # expired
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def add(self, key: Hashable, obj: Any) -> Any:
+        """Store ``obj`` under ``key``, returning whichever object ends up memoized for it."""
+        if self.maxsize <= 0:
+            return obj
+        now = time.monotonic()
+        expiry = now + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            # another thread may have stored the same key in the meantime; keep the first one
+            entry = self._data.get(key)
+            if entry is not None and entry[1] > now:
+                obj = entry[0]
+            else:
+                self._data[key] = (obj, expiry)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return obj
+
+    def discard(self, key: Hashable) -> None:
+        """Drop the object stored under ``key``, if any (i.e. once it is known to be outdated)."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every memoized object and reset the hit/miss counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_default_memo = PackageMemo(ttl=3600)
+
+
+def get_default_memo() -> PackageMemo:
+    """Return the module-wide :class:`PackageMemo` used when populating dependencies, which keeps packages for up to an hour."""
+    return _default_memo
+
+
+__all__ = ["PackageMemo", "canonicalize_name", "get_default_memo"]
@@ -0,0 +1,211 @@
+"""
+otlet.mirror
+======================
+Offline package index sources, and a tool to snapshot packages into one.
+"""
+#
+# Copyright (c) 2022 Noah Tanner
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+import os
+import sys
+import zipfile
+import argparse
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPMessage
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+from urllib.parse import urlsplit
+from .api import _package_url
+from .memo import canonicalize_name
+from .resolver import resolve
+from .session import HTTPResponse, Session
+
+
+def _mirror_path(name: str, release: Optional[str] = None) -> str:
+    # same layout as the JSON API: 'pypi/<name>/json' and 'pypi/<name>/<release>/json'
+    if release:
+        return posixpath.join("pypi", canonicalize_name(name), release, "json")
+    return posixpath.join("pypi", canonicalize_name(name), "json")
+
+
+class MirrorSource:
+    """
+    Read-only package index backed by a local directory or zip archive laid out like the
+    PyPI JSON API (``pypi/<name>/json`` and ``pypi/<name>/<release>/json``), i.e. one made by :func:`snapshot`.
+
+    Can be used anywhere a :class:`~otlet.session.Session` is accepted, so that packages are
+    read from disk instead of the network::
+
+        with MirrorSource("mirror.zip") as source:
+            pkg = PackageObject("requests", session=source)
+
+    or for every object at once, with :func:`~otlet.session.set_default_session`.
+    Anything not in the mirror is answered with a 404, as PyPI would.
+
+    :param path: Mirror directory, or zip archive
+    :type path: str
+
+    .. versionadded:: 1.1.0
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.source_key = ("mirror", os.path.abspath(path))
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._lock = threading.Lock()
+        if not os.path.isdir(path):
+            self._zip = zipfile.ZipFile(path)
+
+    def __enter__(self) -> "MirrorSource":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<MirrorSource '{self.path}'>"
+
+    def _read(self, member: str) -> Optional[bytes]:
+        if self._zip is not None:
+            try:
+                with self._lock:
+                    return self._zip.read(member)
+            except KeyError:
+                return None
+        try:
+            with open(os.path.join(self.path, *member.split("/")), "rb") as f:
+                return f.read()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    def request(
+        self, method: str, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> HTTPResponse:
+        """Answer a JSON API request from the mirror."""
+        parts = urlsplit(url).path.strip("/").split("/")
+        body = None
+        if method in ("GET", "HEAD") and len(parts) in (3, 4) and parts[0] == "pypi" and parts[-1] == "json":
+            body = self._read(_mirror_path(parts[1], parts[2] if len(parts) == 4 else None))
+        if body is None:
+            return HTTPResponse(url, 404, "Not Found", HTTPMessage(), b"")
+        response_headers = HTTPMessage()
+        response_headers["Content-Type"] = "application/json"
+        return HTTPResponse(url, 200, "OK", response_headers, b"" if method == "HEAD" else body)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HTTPResponse:
+        """Shorthand for ``request("GET", url, headers)``."""
+        return self.request("GET", url, headers)
+
+    def close(self) -> None:
+        """Close the archive, if the mirror is one."""
+        if self._zip is not None:
+            self._zip.close()
+
+
+def snapshot(
+    packages: Iterable[Union[str, Tuple[str, Optional[str]]]],
+    destination: str,
+    max_depth: Optional[int] = None,
+    max_workers: int = 8,
+    session: Optional[Session] = None,
+) -> List[str]:
+    """
+    Snapshot packages, and the dependency closure of each, into a mirror readable by :class:`MirrorSource`.
+    For every package in the closure, both its base response and the response for the release chosen
+    by :func:`~otlet.resolver.resolve` are stored, exactly as PyPI served them.
+
+    :param packages: Package names, or ``(name, release)`` tuples
+    :type packages: Iterable[Union[str, Tuple[str, Optional[str]]]]
+
+    :param destination: Directory to write the mirror into, or path of a zip archive to create (ending in ``.zip``)
+    :type destination: str
+
+    :param max_depth: Maximum dependency depth to include, or None for the whole closure (Default: None)
+    :type max_depth: Optional[int]
+
+    :param max_workers: Number of packages fetched at the same time (Default: 8)
+    :type max_workers: int
+
+    :param session: HTTP session to fetch with; one sized to ``max_workers`` is used if not given (optional)
+    :type session: :class:`~otlet.session.Session`
+
+    :return: The mirror paths written
+
+    .. versionadded:: 1.1.0
+    """
+    _session = session or Session(max_connections=max_workers)
+    try:
+        targets: Set[Tuple[str, Optional[str]]] = set()
+        for item in packages:
+            name, release = (item, None) if isinstance(item, str) else item
+            graph = resolve(name, release, max_depth, max_workers, _session)
+            for pkg_name, version in graph.nodes:
+                targets.add((pkg_name, None))
+                targets.add((pkg_name, version))
+
+        def fetch(target: Tuple[str, Optional[str]]) -> Tuple[str, bytes]:
+            res = _session.get(_package_url(*target))
+            if res.status != 200:
+                raise OSError(f"Couldn't fetch '{res.url}' ({res.status} {res.reason})")
+            return _mirror_path(*target), res.body
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            files = sorted(executor.map(fetch, targets))
+    finally:
+        if session is None:
+            _session.close()
+
+    if destination.endswith(".zip"):
+        with zipfile.ZipFile(destination, "w", zipfile.ZIP_DEFLATED) as zf:
+            for path, body in files:
+                zf.writestr(path, body)
+    else:
+        for path, body in files:
+            full = os.path.join(destination, *path.split("/"))
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            with open(full, "wb") as f:
+                f.write(body)
+    return [path for path, _ in files]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m otlet.mirror",
+        description="Snapshot PyPI packages and their dependencies into an offline mirror.",
+    )
+    parser.add_argument("destination", help="directory to write into, or a .zip archive to create")
+    parser.add_argument("packages", nargs="+", help="package names, optionally pinned as 'name==release'")
+    parser.add_argument("--depth", type=int, default=None, help="maximum dependency depth (default: all)")
+    parser.add_argument("--workers", type=int, default=8, help="packages fetched at the same time (default: 8)")
+    args = parser.parse_args(argv)
+
+    packages = [tuple(p.split("==", 1)) if "==" in p else p for p in args.packages]
+    written = snapshot(packages, args.destination, args.depth, args.workers)
+    print(f"wrote {len(written)} responses to {args.destination}")
+    return 0
+
+
+__all__ = ["MirrorSource", "snapshot"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+otlet.packaging.specifiers
+======================
+PEP 440 version specifiers, parsed once into cached comparators.
+"""
+#
+# Copyright (c) 2022 Noah Tanner
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+import operator
+import re
+from functools import lru_cache
+from typing import Callable, Iterator, Optional, Tuple, Union
+from .version import InvalidVersion, LegacyVersion, Version, parse, version_sort_key
+from .version import _MAX_LOCAL
+
+_SPECIFIER_REGEX = re.compile(r"^\s*(~=|===|==|!=|<=|>=|<|>)\s*(\S+?)\s*$")
+_STRIP_REGEX = re.compile(r"[)(\s]")
+
+_AnyVersion = Union[Version, LegacyVersion]
+#: ``(lower key, lower inclusive, upper key, upper inclusive)``, either key being None when unbounded
+Bounds = Tuple[Optional[tuple], bool, Optional[tuple], bool]
+_UNBOUNDED: Bounds = (None, True, None, True)
+
+
+class InvalidSpecifier(ValueError):
+    """
+    An invalid version specifier was found, users should refer to PEP 440.
+    """
+
+
+def _public_key(version: _AnyVersion) -> tuple:
+    # comparison key without the local segment, i.e. '1.0+ubuntu1' -> '1.0'
+    return version._key[:5] if isinstance(version, Version) else version._key
+
+
+def _first_of_series(epoch: int, release: Tuple[int, ...]) -> tuple:
+    # comparison key below every version whose release starts with `release`, i.e. '1.4.dev0' for '1.4'
+    return version_sort_key(Version(f"{epoch}!{'.'.join(map(str, release))}.dev0"))
+
+
+def _next_series(epoch: int, release: Tuple[int, ...]) -> tuple:
+    # comparison key of the first version after every version whose release starts with `release`
+    return _first_of_series(epoch, release[:-1] + (release[-1] + 1,))
+
+
+def _strip_zeros(release: Tuple[int, ...]) -> Tuple[int, ...]:
+    # '1.0.0' and '1' are the same release
+    end = len(release)
+    while end > 1 and release[end - 1] == 0:
+        end -= 1
+    return release[:end]
+
+
+def _padded_release(version: Version, length: int) -> Tuple[int, ...]:
+    release = version.release
+    if len(release) < length:
+        return release + (0,) * (length - len(release))
+    return release[:length]
+
+
+class Specifier:
+    """
+    A single PEP 440 version specifier (i.e. ``'>=1.0'``, ``'~=2.2'``, ``'==1.*'``), compiled into a comparator.
+    Use :func:`parse_specifier` rather than calling this directly, so each specifier string is only parsed once.
+
+    :var operator: Comparison operator of the specifier
+    :vartype operator: str
+
+    :var version: Version string the specifier compares against
+    :vartype version: str
+
+    :var bounds: Range of sort keys (see :func:`~otlet.packaging.version.version_sort_key`) that can satisfy the specifier,
+        as ``(lower, lower inclusive, upper, upper inclusive)``. A key of None means unbounded on that side.
+        Versions inside the range may still fail the specifier, i.e. for ``'>1.0'`` and ``'1.0.post1'``.
+    :vartype bounds: Tuple[Optional[tuple], bool, Optional[tuple], bool]
+
+    .. versionadded:: 1.1.0
+    """
+
+    __slots__ = ("operator", "version", "_check", "bounds")
+
+    def __init__(self, spec: str) -> None:
+        match = _SPECIFIER_REGEX.match(spec)
+        if not match:
+            raise InvalidSpecifier(f"Invalid specifier: '{spec}'")
+        self.operator, self.version = match.groups()
+        try:
+            self._check = self._compile(self.operator, self.version)
+            self.bounds = self._bounds(self.operator, self.version)
+        except InvalidVersion:
+            raise InvalidSpecifier(f"Invalid specifier: '{spec}'") from None
+
+    def __repr__(self) -> str:
+        return f"<Specifier('{self}')>"
+
+    def __str__(self) -> str:
+        return self.operator + self.version
+
+    def __contains__(self, version: Union[str, _AnyVersion]) -> bool:
+        return self.contains(version)
+
+    def contains(self, version: Union[str, _AnyVersion]) -> bool:
+        """Whether ``version`` satisfies the specifier."""
+        if isinstance(version, str):
+            version = parse(version)
+        return self._check(version)
+
+    @staticmethod
+    def _compile(op: str, value: str) -> Callable[[_AnyVersion], bool]:
+        if op == "===":
+            # arbitrary equality, a plain (case-insensitive) string comparison
+            _value = value.lower()
+            return lambda v: str(v).lower() == _value
+
+        if op in ("==", "!=") and value.endswith(".*"):
+            prefix = Version(value[:-2])
+            length = len(prefix.release)
+            if prefix.pre or prefix.post or prefix.dev:
+                # rare prefixes like '==1.0rc1.*', compared on the public version string
+                _text = str(prefix)
+                prefix_match = lambda v: str(v).split("+", 1)[0].startswith(_text)  # noqa: E731
+            else:
+                _epoch, _release = prefix.epoch, prefix.release
+                prefix_match = lambda v: (  # noqa: E731
+                    isinstance(v, Version)
+                    and v.epoch == _epoch
+                    and _padded_release(v, length) == _release
+                )
+            if op == "==":
+                return prefix_match
+            return lambda v: not prefix_match(v)
+
+        spec = Version(value)
+        if op == "~=":
+            # '~=X.Y' is the same as '>=X.Y, ==X.*'
+            if len(spec.release) < 2:
+                raise InvalidVersion(value)
+            _key = spec._key
+            _epoch, _prefix = spec.epoch, spec.release[:-1]
+            length = len(_prefix)
+            return lambda v: (
+                isinstance(v, Version)
+                and v._key >= _key
+                and v.epoch == _epoch
+                and _padded_release(v, length) == _prefix
+            )
+
+        # a specifier without a local segment ignores the local segment of the version,
+        # so i.e. '==1.0' matches '1.0+ubuntu1' and '<=1.0' does too
+        key_of = (lambda v: v._key) if spec.local is not None else _public_key
+        _key = key_of(spec)
+        if op == "==":
+            return lambda v: key_of(v) == _key
+        if op == "!=":
+            return lambda v: key_of(v) != _key
+
+        cmp = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}[op]
+        if op == "<" and not spec.is_prerelease:
+            # '<V' doesn't match pre-releases of V, i.e. nothing from V.dev0 on
+            _limit = key_of(Version(f"{spec.public}.dev0"))
+            return lambda v: key_of(v) < _limit
+        if op == ">" and spec.dev is None and spec.post is None:
+            # '>V' doesn't match post-releases or local versions of V
+            _epoch, _base, _pre = spec.epoch, _strip_zeros(spec.release), spec.pre
+            return lambda v: key_of(v) > _key and not (
+                isinstance(v, Version)
+                and v.epoch == _epoch
+                and v.pre == _pre
+                and _strip_zeros(v.release) == _base
+            )
+        return lambda v: cmp(key_of(v), _key)
+
+    @staticmethod
+    def _bounds(op: str, value: str) -> Bounds:
+        if op in ("!=", "==="):
+            return _UNBOUNDED
+        if value.endswith(".*"):
+            prefix = Version(value[:-2])
+            if prefix.pre or prefix.post or prefix.dev:
+                return _UNBOUNDED
+            return (
+                _first_of_series(prefix.epoch, prefix.release),
+                True,
+                _next_series(prefix.epoch, prefix.release),
+                False,
+            )
+
+        spec = Version(value)
+        key = version_sort_key(spec)
+        # every local version of `spec` sorts between these two
+        lowest = key if spec.local is not None else key[:-1] + ((),)
+        highest = key if spec.local is not None else key[:-1] + (_MAX_LOCAL,)
+        if op == "==":
+            return (lowest, True, highest, True)
+        if op == "~=":
+            return (key, True, _next_series(spec.epoch, spec.release[:-1]), False)
+        if op == ">=":
+            return (key, True, None, True)
+        if op == ">":
+            return (key, False, None, True)
+        if op == "<=":
+            return (None, True, highest, True)
+        return (None, True, key, False)
+
+
+class SpecifierSet:
+    """
+    A set of PEP 440 version specifiers that must all be satisfied, i.e. ``'>=1.0,<2.0,!=1.3.*'``.
+    Use :func:`parse_specifier_set` rather than calling this directly, so each set is only parsed once.
+
+    .. versionadded:: 1.1.0
+    """
+
+    __slots__ = ("specifiers",)
+
+    def __init__(self, specifiers: Tuple[Specifier, ...]) -> None:
+        self.specifiers = specifiers
+
+    def __repr__(self) -> str:
+        return f"<SpecifierSet('{self}')>"
+
+    def __str__(self) -> str:
+        return ",".join(str(s) for s in self.specifiers)
+
+    def __iter__(self) -> Iterator[Specifier]:
+        return iter(self.specifiers)
+
+    def __len__(self) -> int:
+        return len(self.specifiers)
+
+    def __contains__(self, version: Union[str, _AnyVersion]) -> bool:
+        return self.contains(version)
+
+    def contains(self, version: Union[str, _AnyVersion]) -> bool:
+        """Whether ``version`` satisfies every specifier in the set."""
+        if isinstance(version, str):
+            version = parse(version)
+        for spec in self.specifiers:
+            if not spec._check(version):
+                return False
+        return True
+
+
+@lru_cache(maxsize=4096)
+def parse_specifier(spec: str) -> Specifier:
+    """
+    Parse a single version specifier (i.e. ``'>=1.0'``) into a :class:`Specifier`, memoized per string.
+
+    :raises InvalidSpecifier: if ``spec`` is not a valid specifier
+    """
+    return Specifier(spec)
+
+
+@lru_cache(maxsize=4096)
+def parse_specifier_set(specifiers: Union[str, Tuple[str, ...]]) -> SpecifierSet:
+    """
+    Parse version specifiers into a :class:`SpecifierSet`, memoized per input.
+    Takes either a comma-separated string (parentheses and whitespace are ignored) or a tuple of single specifiers.
+
+    :raises InvalidSpecifier: if any specifier is not valid
+    """
+    if isinstance(specifiers, str):
+        specifiers = (specifiers,)
+    return SpecifierSet(
+        tuple(
+            parse_specifier(s)
+            for group in specifiers
+            for s in _STRIP_REGEX.sub("", group).split(",")
+            if s
+        )
+    )
+
+
+__all__ = ["InvalidSpecifier", "Specifier", "SpecifierSet", "parse_specifier", "parse_specifier_set"]
@@ -6,11 +6,20 @@ import collections
 import itertools
 import re
 import warnings
-from typing import Callable, Iterator, List, Optional, SupportsInt, Tuple, Union
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, List, Optional, SupportsInt, Tuple, TypeVar, Union
 
 from ._structures import Infinity, InfinityType, NegativeInfinity, NegativeInfinityType
 
-__all__ = ["parse", "Version", "LegacyVersion", "InvalidVersion", "VERSION_PATTERN"]
+__all__ = [
+    "parse",
+    "Version",
+    "LegacyVersion",
+    "InvalidVersion",
+    "VERSION_PATTERN",
+    "version_sort_key",
+    "sort_versions",
+]
 
 InfiniteTypes = Union[InfinityType, NegativeInfinityType]
 PrePostDevType = Union[InfiniteTypes, Tuple[str, int]]
@@ -39,11 +48,15 @@ _Version = collections.namedtuple(
 )
 
 
+@lru_cache(maxsize=16384)
 def parse(version: str) -> Union["LegacyVersion", "Version"]:
     """
     Parse the given version string and return either a :class:`Version` object
     or a :class:`LegacyVersion` object depending on if the given version is
     a valid PEP 440 version or a legacy version.
+
+    Results are cached by version string, so repeated parses of the same string
+    return the same (immutable) object.
     """
     try:
         return Version(version)
@@ -58,8 +71,19 @@ class InvalidVersion(ValueError):
 
 
 class _BaseVersion:
+    __slots__ = ()
     _key: Union[CmpKey, LegacyCmpKey]
 
+    def __setattr__(self, name: str, value: object) -> None:
+        # instances are shared through parse()'s cache, so they can't change once built
+        if hasattr(self, "_key"):
+            raise AttributeError(f"'{self.__class__.__name__}' object is immutable")
+        object.__setattr__(self, name, value)
+
+    def __reduce__(self) -> Tuple[type, Tuple[str]]:
+        # rebuild from the string, as restoring the slots one by one would trip __setattr__
+        return self.__class__, (str(self),)
+
     def __hash__(self) -> int:
         return hash(self._key)
 
@@ -104,6 +128,8 @@ class _BaseVersion:
 
 
 class LegacyVersion(_BaseVersion):
+    __slots__ = ("_version", "_key", "_sort_key")
+
     def __init__(self, version: str) -> None:
         self._version = str(version)
         self._key = _legacy_cmpkey(self._version)
@@ -249,27 +275,15 @@ VERSION_PATTERN = r"""
 
 
 class Version(_BaseVersion):
+    __slots__ = ("_version", "_key", "_sort_key")
 
     _regex = re.compile(r"^\s*" + VERSION_PATTERN + r"\s*$", re.VERBOSE | re.IGNORECASE)
 
     def __init__(self, version: str) -> None:
 
-        # Validate the version and parse it into pieces
-        match = self._regex.search(version)
-        if not match:
-            raise InvalidVersion(f"Invalid version: '{version}'")
-
-        # Store the parsed out pieces of the version
-        self._version = _Version(
-            epoch=int(match.group("epoch")) if match.group("epoch") else 0,
-            release=tuple(int(i) for i in match.group("release").split(".")),
-            pre=_parse_letter_version(match.group("pre_l"), match.group("pre_n")),
-            post=_parse_letter_version(
-                match.group("post_l"), match.group("post_n1") or match.group("post_n2")
-            ),
-            dev=_parse_letter_version(match.group("dev_l"), match.group("dev_n")),
-            local=_parse_local_version(match.group("local")),
-        )
+        # Validate the version and parse it into pieces; most versions are
+        # already in canonical form, which doesn't need the full pattern
+        self._version = _parse_canonical(version) or _parse_full(version)
 
         # Generate a key which will be used for sorting
         self._key = _cmpkey(
@@ -313,13 +327,13 @@ class Version(_BaseVersion):
         return "".join(parts)
 
     def fits_constraints(self, constraints: Union[str, list]) -> bool:
-        _c = []  # type: ignore
-        if isinstance(constraints, str):
-            constraints = re.sub(r"[)(\s]", "", constraints).split(",")
-        for i in constraints:
-            _h = re.match(r"([=<>!]+)(\S+)", i)
-            exec(f'_c.append(self {_h.group(1)} self.__class__("{_h.group(2)}"))')  # type: ignore
-        return not any([not _ for _ in _c])
+        # specifiers imports this module
+        from ..specifiers import parse_specifier_set
+
+        key: Union[str, Tuple[str, ...]] = (
+            constraints if isinstance(constraints, str) else tuple(constraints)
+        )
+        return parse_specifier_set(key).contains(self)
 
     @property
     def epoch(self) -> int:
@@ -393,6 +407,55 @@ class Version(_BaseVersion):
         return self.release[2] if len(self.release) >= 3 else 0
 
 
+# canonical public versions without an epoch, i.e. '1.2.3', '2.0rc1', '1.0.post1.dev2'
+_release_regex = re.compile(r"[0-9]+(?:\.[0-9]+)*")
+_canonical_regex = re.compile(
+    r"([0-9]+(?:\.[0-9]+)*)(?:(a|b|rc)([0-9]+))?(?:\.post([0-9]+))?(?:\.dev([0-9]+))?"
+)
+
+
+def _parse_canonical(version: str) -> Optional[_Version]:
+    if _release_regex.fullmatch(version):
+        # plain 'N.N.N'
+        return _Version(
+            epoch=0,
+            release=tuple(map(int, version.split("."))),
+            pre=None,
+            post=None,
+            dev=None,
+            local=None,
+        )
+    match = _canonical_regex.fullmatch(version)
+    if not match:
+        return None
+    release, pre_l, pre_n, post, dev = match.groups()
+    return _Version(
+        epoch=0,
+        release=tuple(map(int, release.split("."))),
+        pre=(pre_l, int(pre_n)) if pre_l else None,
+        post=("post", int(post)) if post else None,
+        dev=("dev", int(dev)) if dev else None,
+        local=None,
+    )
+
+
+def _parse_full(version: str) -> _Version:
+    match = Version._regex.search(version)
+    if not match:
+        raise InvalidVersion(f"Invalid version: '{version}'")
+
+    return _Version(
+        epoch=int(match.group("epoch")) if match.group("epoch") else 0,
+        release=tuple(int(i) for i in match.group("release").split(".")),
+        pre=_parse_letter_version(match.group("pre_l"), match.group("pre_n")),
+        post=_parse_letter_version(
+            match.group("post_l"), match.group("post_n1") or match.group("post_n2")
+        ),
+        dev=_parse_letter_version(match.group("dev_l"), match.group("dev_n")),
+        local=_parse_local_version(match.group("local")),
+    )
+
+
 def _parse_letter_version(
     letter: str, number: Union[str, bytes, SupportsInt]
 ) -> Optional[Tuple[str, int]]:
@@ -505,3 +568,67 @@ def _cmpkey(
         )
 
     return epoch, _release, _pre, _post, _dev, _local
+
+
+# version_sort_key() ranks for the pre-release segment, in the same order as _cmpkey()
+_PRE_RANKS = {"a": 1, "b": 2, "rc": 3}
+
+#: version_sort_key() local segment above every other local segment
+_MAX_LOCAL = ((2, 0, ""),)
+
+_V = TypeVar("_V", str, "Version", "LegacyVersion")
+
+
+def _sort_key(version: _Version) -> tuple:
+    # same order as _cmpkey(), using ranks in place of the Infinity sentinels
+    pre, post, dev, local = version.pre, version.post, version.dev, version.local
+    if pre is not None:
+        pre_rank, pre_n = _PRE_RANKS[pre[0]], pre[1]
+    elif post is None and dev is not None:
+        pre_rank, pre_n = 0, 0
+    else:
+        pre_rank, pre_n = 4, 0
+    release = version.release
+    while release and not release[-1]:
+        release = release[:-1]
+    return (
+        version.epoch,
+        release,
+        pre_rank,
+        pre_n,
+        0 if post is None else 1,
+        0 if post is None else post[1],
+        1 if dev is None else 0,
+        0 if dev is None else dev[1],
+        ()
+        if local is None
+        else tuple((1, i, "") if isinstance(i, int) else (0, 0, i) for i in local),
+    )
+
+
+def version_sort_key(version: Union[str, "Version", "LegacyVersion"]) -> tuple:
+    """
+    Sort key for a version (or version string) made only of ints, strings and tuples of them,
+    so that sorting and comparing many versions runs as native tuple comparisons.
+    Keys sort in the same order as the versions themselves, and are cached on each version object.
+    """
+    if isinstance(version, str):
+        version = parse(version)
+    try:
+        return version._sort_key  # type: ignore
+    except AttributeError:
+        pass
+    if isinstance(version, Version):
+        key = _sort_key(version._version)
+    else:
+        # legacy versions sort before every PEP 440 version
+        key = version._key  # type: ignore
+    object.__setattr__(version, "_sort_key", key)
+    return key
+
+
+def sort_versions(versions: Iterable[_V], reverse: bool = False) -> List[_V]:
+    """
+    Sort versions or version strings in version order, returning the items as given.
+    """
+    return sorted(versions, key=version_sort_key, reverse=reverse)
@@ -2,11 +2,15 @@ from . import Version
 
 
 class TopVersion(Version):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__("100!0")
 
 
 class BottomVersion(Version):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__("0")
 
@@ -0,0 +1,442 @@
+"""
+otlet.releases
+======================
+Compact, column-oriented storage for the release files of a PyPI package.
+"""
+#
+# Copyright (c) 2022 Noah Tanner
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+import datetime
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union, cast
+from .api import URLReleaseObject
+from .packaging.specifiers import SpecifierSet, parse_specifier_set
+from .util import _EPOCH, _upload_timestamp
+from .packaging.version import LegacyVersion, Version, parse as parse_version, version_sort_key
+
+# bits of ReleaseTable._flags
+_YANKED = 1
+_HAS_SIG = 2
+_HAS_MD5 = 4
+_HAS_SHA256 = 8
+_HAS_BLAKE2B = 16
+
+_NO_PREFIX = 0xFFFF
+
+
+def _wheel_tags(filename: str) -> Tuple[str, str]:
+    # '{name}-{version}(-{build})?-{python tag}-{abi tag}-{platform tag}.whl'
+    if not filename.endswith(".whl"):
+        return "", ""
+    parts = filename[:-4].split("-")
+    if len(parts) < 5:
+        return "", ""
+    return parts[-2], parts[-1]
+
+
+class _StringPool:
+    """Maps a small set of repeated strings (package types, python tags) to array indexes."""
+
+    __slots__ = ("values", "_index")
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        i = self._index.get(value)
+        if i is None:
+            i = self._index[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+
+class ReleaseTable(Mapping):
+    """
+    Read-only mapping of version string to :class:`~otlet.api.URLReleaseObject`, used for
+    :attr:`~otlet.api.PackageObject.releases`.
+
+    Release data is stored column-wise (timestamps and sizes in arrays, digests as raw bytes,
+    repeated strings pooled) and row objects are only built when accessed, which keeps large
+    packages with thousands of release files small in memory.
+
+    Indexing the table by version gives the first file of that release, as before;
+    :meth:`files`, :meth:`find_files` and :meth:`versions_with` cover every file.
+
+    :param releases: The 'releases' key of a PyPI API response
+    :type releases: Dict[str, List[Dict[str, Any]]]
+
+    :param raw_timestamps: Give ``upload_time`` as seconds since the Unix epoch instead of datetime objects (Default: False)
+    :type raw_timestamps: bool
+
+    .. versionadded:: 1.1.0
+    """
+
+    __slots__ = (
+        "_versions",
+        "_index",
+        "_offsets",
+        "_filenames",
+        "_upload_times",
+        "_sizes",
+        "_flags",
+        "_md5",
+        "_sha256",
+        "_blake2b",
+        "_packagetypes",
+        "_python_versions",
+        "_url_prefixes",
+        "_abi_tags",
+        "_platform_tags",
+        "_strings",
+        "_sparse",
+        "_raw_timestamps",
+        "_tag_index",
+    )
+
+    def __init__(
+        self, releases: Dict[str, List[Dict[str, Any]]], raw_timestamps: bool = False
+    ) -> None:
+        self._raw_timestamps = raw_timestamps
+        self._versions: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._offsets = array("l", [0])
+        self._filenames: List[str] = []
+        self._upload_times = array("q")
+        self._sizes = array("q")
+        self._flags = bytearray()
+        self._md5 = bytearray()
+        self._sha256 = bytearray()
+        self._blake2b = bytearray()
+        self._packagetypes = array("H")
+        self._python_versions = array("H")
+        self._url_prefixes = array("H")
+        # wheel ABI and platform tags, as found in the filename ('' for anything but wheels)
+        self._abi_tags = array("H")
+        self._platform_tags = array("H")
+        self._strings = _StringPool()
+        # rarely-set or irregular values, by row
+        self._sparse: Dict[int, Dict[str, Any]] = {}
+        self._tag_index: Optional[Dict[Tuple[int, str], List[int]]] = None
+
+        for version, files in releases.items():
+            if not files:
+                continue
+            self._index[version] = len(self._versions)
+            self._versions.append(version)
+            for item in files:
+                self._add_row(item)
+            self._offsets.append(len(self._filenames))
+
+    def _add_row(self, item: Dict[str, Any]) -> None:
+        row = len(self._filenames)
+        sparse: Dict[str, Any] = {}
+        filename = item["filename"]
+        digests = dict(item["digests"])
+        flags = (_YANKED if item["yanked"] else 0) | (_HAS_SIG if item["has_sig"] else 0)
+
+        for key, column, width, bit in (
+            ("md5", self._md5, 16, _HAS_MD5),
+            ("sha256", self._sha256, 32, _HAS_SHA256),
+            ("blake2b_256", self._blake2b, 32, _HAS_BLAKE2B),
+        ):
+            value = digests.pop(key, None)
+            if value is not None and len(value) == width * 2:
+                column += bytes.fromhex(value)
+                flags |= bit
+            else:
+                column += bytes(width)
+                if value is not None:
+                    digests[key] = value
+        if digests:
+            sparse["digests"] = digests
+        if item["md5_digest"] != item["digests"].get("md5"):
+            sparse["md5_digest"] = item["md5_digest"]
+
+        # file URLs are almost always '<prefix>/xx/yy/<rest of blake2b digest>/<filename>',
+        # so only the (shared) prefix needs to be stored
+        url = item["url"]
+        blake2b = item["digests"].get("blake2b_256") or ""
+        suffix = f"{blake2b[:2]}/{blake2b[2:4]}/{blake2b[4:]}/{filename}"
+        if blake2b and url.endswith(suffix):
+            self._url_prefixes.append(self._strings.add(url[: -len(suffix)]))
+        else:
+            self._url_prefixes.append(_NO_PREFIX)
+            sparse["url"] = url
+
+        if item["downloads"] != -1:  # legacy attribute, -1 for everything nowadays
+            sparse["downloads"] = item["downloads"]
+        if item["comment_text"]:
+            sparse["comment_text"] = item["comment_text"]
+        if item["yanked_reason"]:
+            sparse["yanked_reason"] = item["yanked_reason"]
+        if sparse:
+            self._sparse[row] = sparse
+
+        self._filenames.append(filename)
+        self._upload_times.append(
+            _upload_timestamp(item.get("upload_time") or item["upload_time_iso_8601"])
+        )
+        self._sizes.append(item["size"])
+        self._flags.append(flags)
+        self._packagetypes.append(self._strings.add(item["packagetype"]))
+        self._python_versions.append(self._strings.add(item["python_version"]))
+        abi, platform = _wheel_tags(filename)
+        self._abi_tags.append(self._strings.add(abi))
+        self._platform_tags.append(self._strings.add(platform))
+
+    def _row(self, row: int) -> URLReleaseObject:
+        sparse = self._sparse.get(row, {})
+        flags = self._flags[row]
+        digests = {}
+        if flags & _HAS_MD5:
+            digests["md5"] = self._md5[row * 16 : row * 16 + 16].hex()
+        if flags & _HAS_SHA256:
+            digests["sha256"] = self._sha256[row * 32 : row * 32 + 32].hex()
+        if flags & _HAS_BLAKE2B:
+            digests["blake2b_256"] = self._blake2b[row * 32 : row * 32 + 32].hex()
+        digests.update(sparse.get("digests", {}))
+
+        filename = self._filenames[row]
+        prefix = self._url_prefixes[row]
+        if prefix == _NO_PREFIX:
+            url = sparse["url"]
+        else:
+            b = digests["blake2b_256"]
+            url = f"{self._strings.values[prefix]}{b[:2]}/{b[2:4]}/{b[4:]}/{filename}"
+
+        return URLReleaseObject(
+            sparse.get("comment_text", ""),
+            SimpleNamespace(**digests),
+            sparse.get("downloads", -1),
+            filename,
+            bool(flags & _HAS_SIG),
+            # None only if PyPI sent no MD5 at all, as URLReleaseObject.construct would pass on
+            cast(str, sparse.get("md5_digest", digests.get("md5"))),
+            self._strings.values[self._packagetypes[row]],
+            self._strings.values[self._python_versions[row]],
+            self._sizes[row],
+            self._upload_times[row]
+            if self._raw_timestamps
+            else _EPOCH + datetime.timedelta(seconds=self._upload_times[row]),
+            url,
+            bool(flags & _YANKED),
+            sparse.get("yanked_reason"),
+        )
+
+    def __getitem__(self, version: str) -> URLReleaseObject:
+        return self._row(self._offsets[self._index[version]])
+
+    def files(self, version: str) -> List[URLReleaseObject]:
+        """Every release file of ``version`` (indexing the table only gives the first one)."""
+        i = self._index[version]
+        return [self._row(row) for row in range(self._offsets[i], self._offsets[i + 1])]
+
+    def _build_tag_index(self) -> Dict[Tuple[int, str], List[int]]:
+        # (column, tag) -> rows, with compressed tag sets (i.e. 'py2.py3') split into each tag
+        index: Dict[Tuple[int, str], List[int]] = {}
+        values = self._strings.values
+        for column_no, column in enumerate(
+            (self._packagetypes, self._python_versions, self._platform_tags, self._abi_tags)
+        ):
+            for row, value in enumerate(column):
+                for tag in values[value].split(".") if column_no else (values[value],):
+                    if tag:
+                        index.setdefault((column_no, tag), []).append(row)
+        return index
+
+    def _rows_matching(
+        self,
+        packagetype: Optional[str],
+        python_tag: Optional[Union[str, Iterable[str]]],
+        platform_tag: Optional[Union[str, Iterable[str]]],
+        abi_tag: Optional[Union[str, Iterable[str]]],
+    ) -> List[int]:
+        if self._tag_index is None:
+            self._tag_index = self._build_tag_index()
+        rows: Optional[Set[int]] = None
+        for column_no, wanted in enumerate((packagetype, python_tag, platform_tag, abi_tag)):
+            if wanted is None:
+                continue
+            tags = (wanted,) if isinstance(wanted, str) else wanted
+            matching: Set[int] = set()
+            for tag in tags:
+                matching.update(self._tag_index.get((column_no, tag), ()))
+            rows = matching if rows is None else rows & matching
+        if rows is None:
+            return list(range(len(self._filenames)))
+        return sorted(rows)
+
+    def find_files(
+        self,
+        packagetype: Optional[str] = None,
+        python_tag: Optional[Union[str, Iterable[str]]] = None,
+        platform_tag: Optional[Union[str, Iterable[str]]] = None,
+        abi_tag: Optional[Union[str, Iterable[str]]] = None,
+    ) -> List[Tuple[str, URLReleaseObject]]:
+        """
+        Every release file matching all of the given criteria, as ``(version, file)`` pairs in table order.
+        i.e. ``find_files("bdist_wheel", "cp311", ["manylinux_2_17_x86_64", "manylinux2014_x86_64"])``.
+
+        :param packagetype: Package type (i.e. ``'bdist_wheel'`` or ``'sdist'``)
+        :type packagetype: Optional[str]
+
+        :param python_tag: Python tag, or any of several (i.e. ``'cp311'``, ``'py3'``; ``'source'`` for source distributions)
+        :type python_tag: Optional[Union[str, Iterable[str]]]
+
+        :param platform_tag: Wheel platform tag, or any of several (i.e. ``'win_amd64'``, ``'any'``)
+        :type platform_tag: Optional[Union[str, Iterable[str]]]
+
+        :param abi_tag: Wheel ABI tag, or any of several (i.e. ``'cp311'``, ``'abi3'``, ``'none'``)
+        :type abi_tag: Optional[Union[str, Iterable[str]]]
+        """
+        return [
+            (self._versions[bisect_right(self._offsets, row) - 1], self._row(row))
+            for row in self._rows_matching(packagetype, python_tag, platform_tag, abi_tag)
+        ]
+
+    def versions_with(
+        self,
+        packagetype: Optional[str] = None,
+        python_tag: Optional[Union[str, Iterable[str]]] = None,
+        platform_tag: Optional[Union[str, Iterable[str]]] = None,
+        abi_tag: Optional[Union[str, Iterable[str]]] = None,
+    ) -> List[str]:
+        """
+        Every version with at least one release file matching all of the given criteria (see :meth:`find_files`),
+        without building any file objects.
+        """
+        versions: List[str] = []
+        for row in self._rows_matching(packagetype, python_tag, platform_tag, abi_tag):
+            version = self._versions[bisect_right(self._offsets, row) - 1]
+            if not versions or versions[-1] != version:
+                versions.append(version)
+        return versions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._versions)
+
+    def __len__(self) -> int:
+        return len(self._versions)
+
+    def __contains__(self, version: object) -> bool:
+        return version in self._index
+
+    def __repr__(self) -> str:
+        return f"<ReleaseTable versions={len(self)}>"
+
+    def upload_timestamp(self, version: str) -> int:
+        """Upload time of ``version``, as a Unix timestamp, without building its row object."""
+        return self._upload_times[self._offsets[self._index[version]]]
+
+    def is_yanked(self, version: str) -> bool:
+        """Whether ``version`` has been yanked, without building its row object."""
+        return bool(self._flags[self._offsets[self._index[version]]] & _YANKED)
+
+
+class VersionIndex:
+    """
+    Sorted index of the versions in a :class:`ReleaseTable`, used to find the highest version
+    satisfying a set of specifiers without parsing and checking every release.
+
+    Versions are parsed and sorted once. Queries narrow the candidates to the range allowed by
+    the specifiers' bounds with a binary search, then walk down from the top of that range.
+
+    :param releases: Releases to index
+    :type releases: :class:`ReleaseTable`
+
+    :var versions: Every indexed version, lowest first
+    :vartype versions: List[Union[:class:`packaging.version.Version`, :class:`packaging.version.LegacyVersion`]]
+
+    .. versionadded:: 1.1.0
+    """
+
+    __slots__ = ("versions", "_keys", "_prerelease", "_yanked")
+
+    def __init__(self, releases: ReleaseTable) -> None:
+        indexed = sorted(
+            (version_sort_key(v), parse_version(v), releases.is_yanked(v)) for v in releases
+        )
+        self.versions: List[Union[Version, LegacyVersion]] = [v for _, v, _ in indexed]
+        self._keys = [k for k, _, _ in indexed]
+        self._prerelease = bytearray(v.is_prerelease for v in self.versions)
+        self._yanked = bytearray(y for _, _, y in indexed)
+
+    def __len__(self) -> int:
+        return len(self.versions)
+
+    def __repr__(self) -> str:
+        return f"<VersionIndex versions={len(self)}>"
+
+    def _range(self, specifiers: SpecifierSet) -> range:
+        lo, hi = 0, len(self._keys)
+        for spec in specifiers:
+            lower, lower_inclusive, upper, upper_inclusive = spec.bounds
+            if lower is not None:
+                lo = max(
+                    lo,
+                    (bisect_left if lower_inclusive else bisect_right)(self._keys, lower),
+                )
+            if upper is not None:
+                hi = min(
+                    hi,
+                    (bisect_right if upper_inclusive else bisect_left)(self._keys, upper),
+                )
+        return range(hi - 1, lo - 1, -1)
+
+    def latest(
+        self,
+        specifiers: Optional[Union[str, Iterable[str], SpecifierSet]] = None,
+        allow_pre: bool = False,
+        allow_yanked: bool = True,
+    ) -> Optional[Union[Version, LegacyVersion]]:
+        """
+        Highest indexed version satisfying ``specifiers``, or None if there is none.
+
+        :param specifiers: Version constraints, as a comma-separated string, a list of single constraints or a :class:`~otlet.packaging.specifiers.SpecifierSet` (optional)
+        :type specifiers: Optional[Union[str, Iterable[str], :class:`~otlet.packaging.specifiers.SpecifierSet`]]
+
+        :param allow_pre: Whether pre-releases may be chosen (Default: False)
+        :type allow_pre: bool
+
+        :param allow_yanked: Whether yanked releases may be chosen (Default: True)
+        :type allow_yanked: bool
+        """
+        if specifiers is None:
+            specifiers = parse_specifier_set(())
+        elif not isinstance(specifiers, SpecifierSet):
+            specifiers = parse_specifier_set(
+                specifiers if isinstance(specifiers, str) else tuple(specifiers)
+            )
+        for i in self._range(specifiers):
+            if not allow_pre and self._prerelease[i]:
+                continue
+            if not allow_yanked and self._yanked[i]:
+                continue
+            if specifiers.contains(self.versions[i]):
+                return self.versions[i]
+        return None
+
+
+__all__ = ["ReleaseTable", "VersionIndex"]
@@ -0,0 +1,159 @@
+"""
+otlet.requirements
+======================
+PEP 508 dependency specifier parsing.
+"""
+#
+# Copyright (c) 2022 Noah Tanner
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+from .exceptions import InvalidRequirement
+
+_REQUIREMENT_REGEX = re.compile(
+    r"""
+    ^\s*
+    (?P<name>[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)
+    \s*
+    (?:\[(?P<extras>[^\]]*)\])?
+    \s*
+    (?:
+        @\s*(?P<url>[^\s;]+)                  # direct reference
+        |
+        \(?(?P<specifier>[^;()]*?)\)?         # version specifier, optionally in parentheses
+    )
+    \s*
+    (?:;\s*(?P<marker>.*?))?
+    \s*$
+    """,
+    re.VERBOSE,
+)
+_SPECIFIER_REGEX = re.compile(r"^(?:\s*(?:~=|===|==|!=|<=|>=|<|>)\s*[^,\s]+\s*(?:,|$))*$")
+_WHITESPACE_REGEX = re.compile(r"\s+")
+_EXTRA_NAME_REGEX = re.compile(r"^[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?$")
+
+
+class Requirement:
+    """
+    A parsed PEP 508 dependency specifier, i.e. ``'coverage[toml] (>=5.0.2); python_version < "3.11"'``.
+    Instances are shared between identical requirement strings, so they should be treated as read-only.
+
+    :var name: Name of the required package
+    :vartype name: str
+
+    :var extras: Extras requested for the required package
+    :vartype extras: Tuple[str, ...]
+
+    :var specifier: Comma-separated version constraints, without whitespace or parentheses (i.e. ``'>=5.0.2,<6.0.0'``)
+    :vartype specifier: str
+
+    :var marker: Environment marker expression, if any
+    :vartype marker: Optional[str]
+
+    :var url: Direct reference URL, if any
+    :vartype url: Optional[str]
+
+    .. versionadded:: 1.1.0
+    """
+
+    __slots__ = ("name", "extras", "specifier", "marker", "url")
+
+    def __init__(
+        self,
+        name: str,
+        extras: Tuple[str, ...] = (),
+        specifier: str = "",
+        marker: Optional[str] = None,
+        url: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.extras = extras
+        self.specifier = specifier
+        self.marker = marker
+        self.url = url
+
+    def _astuple(self) -> tuple:
+        return (self.name, self.extras, self.specifier, self.marker, self.url)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Requirement):
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    def __hash__(self) -> int:
+        return hash(self._astuple())
+
+    def __repr__(self) -> str:
+        return f"<Requirement('{self}')>"
+
+    def __str__(self) -> str:
+        parts = [self.key]
+        if self.url:
+            parts.append(f" @ {self.url}")
+        elif self.specifier:
+            parts.append(self.specifier)
+        if self.marker:
+            parts.append(f"; {self.marker}")
+        return "".join(parts)
+
+    @property
+    def key(self) -> str:
+        """Package name including any extras, i.e. ``'coverage[toml]'``."""
+        if self.extras:
+            return f"{self.name}[{','.join(self.extras)}]"
+        return self.name
+
+
+@lru_cache(maxsize=8192)
+def parse_requirement(requirement: str) -> Requirement:
+    """
+    Parse a PEP 508 dependency specifier into a :class:`Requirement`.
+    Results are memoized, since the same requirement strings show up across many packages.
+
+    :raises InvalidRequirement: if ``requirement`` is not a valid dependency specifier
+    """
+    match = _REQUIREMENT_REGEX.match(requirement)
+    if not match:
+        raise InvalidRequirement(requirement)
+
+    extras: Tuple[str, ...] = ()
+    if match.group("extras"):
+        extras = tuple(e.strip() for e in match.group("extras").split(",") if e.strip())
+        if not all(_EXTRA_NAME_REGEX.match(e) for e in extras):
+            raise InvalidRequirement(requirement)
+
+    specifier = match.group("specifier") or ""
+    if specifier:
+        if not _SPECIFIER_REGEX.match(specifier):
+            raise InvalidRequirement(requirement)
+        specifier = _WHITESPACE_REGEX.sub("", specifier)
+
+    return Requirement(
+        match.group("name"),
+        extras,
+        specifier,
+        match.group("marker") or None,
+        match.group("url"),
+    )
+
+
+__all__ = ["Requirement", "parse_requirement"]
@@ -0,0 +1,271 @@
+"""
+otlet.resolver
+======================
+Breadth-first, concurrent resolution of a package's dependency tree into a graph.
+"""
+#
+# Copyright (c) 2022 Noah Tanner
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from .api import PackageObject, PackageDependencyObject
+from .memo import canonicalize_name, get_default_memo
+from .session import Session
+
+#: Key identifying a node in a :class:`DependencyGraph`: ``(canonicalized name, version)``
+NodeKey = Tuple[str, str]
+
+
+class DependencyNode(NamedTuple):
+    """
+    A single resolved package in a :class:`DependencyGraph`. Should not be directly called.
+
+    :param key: ``(canonicalized name, version)`` of this node
+    :type key: Tuple[str, str]
+
+    :param package: The resolved package
+    :type package: :class:`~otlet.api.PackageObject`
+
+    :param depth: Depth at which the package was first reached (the root is at depth 0)
+    :type depth: int
+
+    .. versionadded:: 1.1.0
+    """
+
+    key: NodeKey
+    package: PackageObject
+    depth: int
+
+    @property
+    def name(self) -> str:
+        return self.key[0]
+
+    @property
+    def version(self) -> str:
+        return self.key[1]
+
+
+class DependencyEdge(NamedTuple):
+    """
+    A requirement of one node on another in a :class:`DependencyGraph`. Should not be directly called.
+
+    :param parent: Key of the requiring node
+    :type parent: Tuple[str, str]
+
+    :param child: Key of the node chosen to satisfy the requirement
+    :type child: Tuple[str, str]
+
+    :param version_constraints: Version constraints of the requirement, if any
+    :type version_constraints: Optional[List[str]]
+
+    .. versionadded:: 1.1.0
+    """
+
+    parent: NodeKey
+    child: NodeKey
+    version_constraints: Optional[List[str]]
+
+
+class DependencyGraph:
+    """
+    Dependency graph produced by :func:`resolve`.
+
+    :var root: Key of the root package
+    :vartype root: Tuple[str, str]
+
+    :var nodes: Every resolved package, by key
+    :vartype nodes: Dict[Tuple[str, str], :class:`DependencyNode`]
+
+    :var edges: Every requirement between two resolved packages
+    :vartype edges: List[:class:`DependencyEdge`]
+
+    :var cycles: Every cycle found in the graph, as a list of node keys starting and ending on the same node
+    :vartype cycles: List[List[Tuple[str, str]]]
+
+    :var errors: Exceptions raised while resolving a requirement, by requirement name
+    :vartype errors: Dict[str, Exception]
+
+    .. versionadded:: 1.1.0
+    """
+
+    def __init__(self, root: DependencyNode) -> None:
+        self.root = root.key
+        self.nodes: Dict[NodeKey, DependencyNode] = {root.key: root}
+        self.edges: List[DependencyEdge] = []
+        self.cycles: List[List[NodeKey]] = []
+        self.errors: Dict[str, Exception] = {}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __repr__(self) -> str:
+        return f"<DependencyGraph root={self.root} nodes={len(self.nodes)} edges={len(self.edges)}>"
+
+    def children(self, key: NodeKey) -> List[NodeKey]:
+        return [e.child for e in self.edges if e.parent == key]
+
+    def parents(self, key: NodeKey) -> List[NodeKey]:
+        return [e.parent for e in self.edges if e.child == key]
+
+    def _find_cycles(self) -> List[List[NodeKey]]:
+        adjacency: Dict[NodeKey, List[NodeKey]] = {k: [] for k in self.nodes}
+        for e in self.edges:
+            adjacency[e.parent].append(e.child)
+
+        # iterative DFS; an edge back to a node still on the stack closes a cycle
+        cycles = []
+        done: Set[NodeKey] = set()
+        for start in self.nodes:
+            if start in done:
+                continue
+            path = [start]
+            on_path = {start}
+            stack = [iter(adjacency[start])]
+            while stack:
+                child = next(stack[-1], None)
+                if child is None:
+                    stack.pop()
+                    done.add(path[-1])
+                    on_path.discard(path.pop())
+                elif child in on_path:
+                    cycles.append(path[path.index(child):] + [child])
+                elif child not in done:
+                    path.append(child)
+                    on_path.add(child)
+                    stack.append(iter(adjacency[child]))
+        return cycles
+
+
+def resolve(
+    package_name: str,
+    release: Optional[str] = None,
+    max_depth: Optional[int] = None,
+    max_workers: int = 8,
+    session: Optional[Session] = None,
+) -> DependencyGraph:
+    """
+    Resolve the dependency tree of a package level by level, fetching every package on
+    a level concurrently. Each (package, version) pair is fetched and expanded only once,
+    no matter how many times it shows up in the tree.
+
+    Versions are chosen the same way as :meth:`~otlet.api.PackageDependencyObject.populate` does.
+
+    :param package_name: Name of the root PyPI package
+    :type package_name: str
+
+    :param release: Specific version of the root package (optional)
+    :type release: str
+
+    :param max_depth: Maximum depth to resolve to, or None for the whole tree (Default: None)
+    :type max_depth: Optional[int]
+
+    :param max_workers: Number of packages fetched at the same time (Default: 8)
+    :type max_workers: int
+
+    :param session: HTTP session shared by all workers; one sized to ``max_workers`` is used if not given (optional)
+    :type session: :class:`~otlet.session.Session`
+
+    .. versionadded:: 1.1.0
+    """
+    _session = session or Session(max_connections=max_workers)
+    memo = get_default_memo()
+    try:
+        root_pkg = memo.get(package_name, release, _session)
+        graph = DependencyGraph(
+            DependencyNode(_node_key(root_pkg), root_pkg, 0)
+        )
+        frontier = [(graph.root, dep) for dep in root_pkg.dependencies or []]
+        depth = 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while frontier and (max_depth is None or depth <= max_depth):
+                # resolve each distinct requirement once, then fetch each distinct release once
+                requirements: Dict[Tuple, PackageDependencyObject] = {}
+                for _, dep in frontier:
+                    requirements.setdefault(_requirement_key(dep), dep)
+                bases = dict(
+                    zip(
+                        requirements,
+                        executor.map(
+                            lambda d: _attempt(memo.get, d.name, None, _session),
+                            requirements.values(),
+                        ),
+                    )
+                )
+                chosen: Dict[Tuple, Tuple[str, Optional[str]]] = {}
+                for rkey, dep in requirements.items():
+                    base = bases[rkey]
+                    if isinstance(base, Exception):
+                        graph.errors[dep.name] = base
+                        continue
+                    version = dep._select_version(base)
+                    chosen[rkey] = (dep.name, str(version) if version else None)
+                targets = set(chosen.values())
+                fetched = dict(
+                    zip(
+                        targets,
+                        executor.map(
+                            lambda t: _attempt(memo.get, t[0], t[1], _session), targets
+                        ),
+                    )
+                )
+
+                next_frontier: List[Tuple[NodeKey, PackageDependencyObject]] = []
+                for parent, dep in frontier:
+                    target = chosen.get(_requirement_key(dep))
+                    if target is None:
+                        continue
+                    pkg = fetched[target]
+                    if isinstance(pkg, Exception):
+                        graph.errors[dep.name] = pkg
+                        continue
+                    key = _node_key(pkg)
+                    graph.edges.append(DependencyEdge(parent, key, dep.version_constraints))
+                    if key not in graph.nodes:
+                        graph.nodes[key] = DependencyNode(key, pkg, depth)
+                        next_frontier.extend((key, d) for d in pkg.dependencies or [])
+                frontier = next_frontier
+                depth += 1
+        graph.cycles = graph._find_cycles()
+        return graph
+    finally:
+        if session is None:
+            _session.close()
+
+
+def _node_key(package: PackageObject) -> NodeKey:
+    return canonicalize_name(package.name), package.version
+
+
+def _requirement_key(dep: PackageDependencyObject) -> Tuple:
+    return (
+        canonicalize_name(dep.name),
+        tuple(dep.version_constraints or ()),
+    )
+
+
+def _attempt(func, *args):
+    try:
+        return func(*args)
+    except Exception as err:
+        return err
+
+
+__all__ = ["DependencyNode", "DependencyEdge", "DependencyGraph", "resolve"]
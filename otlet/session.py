@@ -0,0 +1,388 @@
+"""
+otlet.session
+======================
+Persistent HTTP(S) session used by otlet for talking to the PyPI JSON Web API.
+"""
+#
+# Copyright (c) 2022 Noah Tanner
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+import threading
+import time
+import zlib
+from http.client import HTTPConnection, HTTPSConnection, HTTPException, HTTPMessage
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+from .cache import CacheEntry, ResponseCache
+
+#: Base URL used for all PyPI JSON API requests.
+PYPI_URL = "https://pypi.org"
+
+_USER_AGENT = "otlet (https://github.com/nhtnr/otlet)"
+_MAX_REDIRECTS = 5
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+_CHUNK_SIZE = 64 * 1024
+
+
+def _request_headers(headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+    _headers = {
+        "User-Agent": _USER_AGENT,
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate",
+    }
+    if headers:
+        _headers.update(headers)
+    return _headers
+
+
+def _cache_response(
+    cache: Optional[ResponseCache],
+    entry: Optional[CacheEntry],
+    url: str,
+    res: "HTTPResponse",
+) -> "HTTPResponse":
+    """Store or refresh the cache entry for ``url`` based on ``res``, returning the response to hand back."""
+    if cache is None:
+        return res
+    if entry is not None and res.status == 304:
+        return HTTPResponse.from_cache(cache.refresh(entry))
+    if res.status == 200:
+        serial = res.headers.get("X-PyPI-Last-Serial")
+        cache.store(
+            url,
+            res.body,
+            res.headers.get("ETag"),
+            res.headers.get("Last-Modified"),
+            int(serial) if serial and serial.isdigit() else None,
+        )
+    return res
+
+
+class RequestStats(NamedTuple):
+    """
+    Transfer statistics for a single response received over the network, passed to a session's ``stats_hook``.
+
+    :param url: URL that produced the response
+    :type url: str
+
+    :param status: HTTP status code
+    :type status: int
+
+    :param content_encoding: ``Content-Encoding`` the body was sent with (i.e. ``'gzip'``), if any
+    :type content_encoding: Optional[str]
+
+    :param wire_bytes: Size of the body as received, before decompression
+    :type wire_bytes: int
+
+    :param body_bytes: Size of the body after decompression
+    :type body_bytes: int
+
+    :param elapsed: Time from sending the request to having the whole body decoded, in seconds
+    :type elapsed: float
+
+    :param decode_time: Time spent decompressing the body, in seconds
+    :type decode_time: float
+
+    .. versionadded:: 1.1.0
+    """
+
+    url: str
+    status: int
+    content_encoding: Optional[str]
+    wire_bytes: int
+    body_bytes: int
+    elapsed: float
+    decode_time: float
+
+
+class _BodyDecoder:
+    """Decompresses a ``gzip``/``deflate`` response body as it is read, keeping count of bytes on the wire."""
+
+    __slots__ = ("encoding", "wire_bytes", "decode_time", "_decompressor", "_chunks")
+
+    def __init__(self, encoding: Optional[str]) -> None:
+        self.encoding = encoding.strip().lower() if encoding else None
+        self.wire_bytes = 0
+        self.decode_time = 0.0
+        self._decompressor = None
+        if self.encoding in ("gzip", "x-gzip"):
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self._chunks: List[bytes] = []
+
+    def feed(self, chunk: bytes) -> None:
+        self.wire_bytes += len(chunk)
+        if self.encoding == "deflate" and self._decompressor is None and chunk:
+            # 'deflate' should be zlib-wrapped, but some servers send a raw deflate stream
+            wbits = zlib.MAX_WBITS if chunk[0] & 0x0F == 8 else -zlib.MAX_WBITS
+            self._decompressor = zlib.decompressobj(wbits)
+        if self._decompressor is None:
+            self._chunks.append(chunk)
+            return
+        start = time.perf_counter()
+        self._chunks.append(self._decompressor.decompress(chunk))
+        self.decode_time += time.perf_counter() - start
+
+    def finish(self) -> bytes:
+        if self._decompressor is not None:
+            self._chunks.append(self._decompressor.flush())
+        return b"".join(self._chunks)
+
+
+def _report_stats(
+    hook: Optional[Callable[[RequestStats], None]],
+    url: str,
+    status: int,
+    decoder: _BodyDecoder,
+    body: bytes,
+    start: float,
+) -> None:
+    if hook is not None:
+        hook(
+            RequestStats(
+                url,
+                status,
+                decoder.encoding,
+                decoder.wire_bytes,
+                len(body),
+                time.perf_counter() - start,
+                decoder.decode_time,
+            )
+        )
+
+
+class HTTPResponse:
+    """
+    Fully-read HTTP response returned by :meth:`Session.request`. Should not be directly called.
+
+    :var url: URL that produced this response (after following redirects)
+    :vartype url: str
+
+    :var status: HTTP status code
+    :vartype status: int
+
+    :var reason: HTTP reason phrase
+    :vartype reason: str
+
+    :var headers: Response headers
+    :vartype headers: :class:`http.client.HTTPMessage`
+
+    :var body: Response body, decompressed if it was sent with a ``Content-Encoding``
+    :vartype body: bytes
+
+    .. versionadded:: 1.1.0
+    """
+
+    __slots__ = ("url", "status", "reason", "headers", "body")
+
+    def __init__(self, url: str, status: int, reason: str, headers, body: bytes) -> None:
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    def __repr__(self) -> str:
+        return f"<HTTPResponse [{self.status}] {self.url}>"
+
+    @classmethod
+    def from_cache(cls, entry: CacheEntry) -> "HTTPResponse":
+        headers = HTTPMessage()
+        if entry.etag:
+            headers["ETag"] = entry.etag
+        if entry.last_modified:
+            headers["Last-Modified"] = entry.last_modified
+        if entry.last_serial is not None:
+            headers["X-PyPI-Last-Serial"] = str(entry.last_serial)
+        return cls(entry.url, 200, "OK", headers, entry.body)
+
+
+class Session:
+    """
+    Thread-safe HTTP session keeping a pool of keep-alive connections per host,
+    so that consecutive requests to PyPI reuse a single TCP/TLS handshake.
+
+    A session can be shared between any number of :class:`~otlet.api.PackageObject`,
+    :class:`~otlet.api.PackageInfoObject` and :class:`~otlet.api.PackageDependencyObject`
+    instances via their ``session`` argument. If none is given, :func:`get_default_session` is used.
+
+    :param max_connections: Maximum number of idle connections kept open per host (Default: 10)
+    :type max_connections: int
+
+    :param timeout: Socket timeout, in seconds (Default: 30)
+    :type timeout: float
+
+    :param cache: On-disk response cache to consult before, and revalidate against, the network (optional)
+    :type cache: :class:`~otlet.cache.ResponseCache`
+
+    :param stats_hook: Called with a :class:`RequestStats` for every response received over the network (optional)
+    :type stats_hook: Callable[[:class:`RequestStats`], None]
+
+    Responses are requested with ``gzip``/``deflate`` compression and decompressed as they are read.
+
+    .. versionadded:: 1.1.0
+    """
+
+    #: Where responses come from, which keeps packages from different sources apart in a :class:`~otlet.memo.PackageMemo`
+    source_key: Hashable = PYPI_URL
+
+    def __init__(
+        self,
+        max_connections: int = 10,
+        timeout: float = 30,
+        cache: Optional[ResponseCache] = None,
+        stats_hook: Optional[Callable[[RequestStats], None]] = None,
+    ) -> None:
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.cache = cache
+        self.stats_hook = stats_hook
+        self._pool: Dict[Tuple[str, str, int], List[HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "Session":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _acquire(self, key: Tuple[str, str, int], fresh: bool = False) -> HTTPConnection:
+        if not fresh:
+            with self._lock:
+                idle = self._pool.get(key)
+                if idle:
+                    return idle.pop()
+        scheme, host, port = key
+        if scheme == "https":
+            return HTTPSConnection(host, port, timeout=self.timeout)
+        return HTTPConnection(host, port, timeout=self.timeout)
+
+    def _release(self, key: Tuple[str, str, int], conn: HTTPConnection) -> None:
+        with self._lock:
+            idle = self._pool.setdefault(key, [])
+            if len(idle) < self.max_connections:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _send(self, method: str, url: str, headers: Dict[str, str]) -> HTTPResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme or "https"
+        key = (scheme, parts.hostname or "", parts.port or (443 if scheme == "https" else 80))
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        # a pooled connection may have been closed by the server while idle,
+        # so retry exactly once on a fresh connection before giving up
+        retried = False
+        while True:
+            conn = self._acquire(key, fresh=retried)
+            try:
+                start = time.perf_counter()
+                conn.request(method, path, headers=headers)
+                res = conn.getresponse()
+                decoder = _BodyDecoder(res.headers.get("Content-Encoding"))
+                chunk = res.read(_CHUNK_SIZE)
+                while chunk:
+                    decoder.feed(chunk)
+                    chunk = res.read(_CHUNK_SIZE)
+                body = decoder.finish()
+                break
+            except (HTTPException, ConnectionError):
+                conn.close()
+                if retried:
+                    raise
+                retried = True
+            except BaseException:
+                # i.e. socket.timeout: the connection is left mid-response
+                conn.close()
+                raise
+        if res.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+        _report_stats(self.stats_hook, url, res.status, decoder, body, start)
+        return HTTPResponse(url, res.status, res.reason, res.headers, body)
+
+    def request(
+        self, method: str, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> HTTPResponse:
+        """Perform an HTTP request, following redirects, and return the fully-read response."""
+        _headers = _request_headers(headers)
+        cache = self.cache if method == "GET" else None
+        entry = cache.get(url) if cache is not None else None
+        if entry is not None:
+            if cache.is_fresh(entry):  # type: ignore
+                return HTTPResponse.from_cache(entry)
+            _headers.update(entry.conditional_headers())
+
+        res = self._follow(method, url, _headers)
+        return _cache_response(cache, entry, url, res)
+
+    def _follow(self, method: str, url: str, headers: Dict[str, str]) -> HTTPResponse:
+        for _ in range(_MAX_REDIRECTS + 1):
+            res = self._send(method, url, headers)
+            if res.status not in _REDIRECT_CODES:
+                return res
+            url = urljoin(url, res.headers["Location"])
+        return res
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HTTPResponse:
+        """Shorthand for ``request("GET", url, headers)``."""
+        return self.request("GET", url, headers)
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        with self._lock:
+            pool, self._pool = self._pool, {}
+        for conns in pool.values():
+            for conn in conns:
+                conn.close()
+
+
+_default_session: Optional[Session] = None
+_default_lock = threading.Lock()
+
+
+def get_default_session() -> Session:
+    """Return the module-wide :class:`Session` shared by every object that isn't given one explicitly."""
+    global _default_session
+    if _default_session is None:
+        with _default_lock:
+            if _default_session is None:
+                _default_session = Session()
+    return _default_session
+
+
+def set_default_session(session: Session) -> None:
+    """Replace the module-wide default :class:`Session` (i.e. with one that has a :class:`~otlet.cache.ResponseCache`)."""
+    global _default_session
+    with _default_lock:
+        _default_session = session
+
+
+__all__ = [
+    "RequestStats",
+    "HTTPResponse",
+    "Session",
+    "get_default_session",
+    "set_default_session",
+    "PYPI_URL",
+]
@@ -0,0 +1,273 @@
+"""
+otlet.sync
+======================
+Incremental re-syncing of many packages, only refetching the ones that changed since the last run.
+"""
+#
+# Copyright (c) 2022 Noah Tanner
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+import os
+import json
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from .api import _RELEASES_KEY, PackageObject, _load_json, _package_url, _raise_for_status
+from .memo import PackageMemo, canonicalize_name, get_default_memo
+from .session import Session
+from .util import _atomic_write
+
+_FORMAT_VERSION = 1
+
+
+class SyncState:
+    """
+    Last seen serial (``last_serial``) of each package, optionally persisted to a JSON file between runs.
+
+    :param path: File to load the state from (if it exists) and :meth:`save` it to (optional; kept in memory otherwise)
+    :type path: Optional[str]
+
+    :var serials: Last seen serial, by canonicalized package name
+    :vartype serials: Dict[str, int]
+
+    .. versionadded:: 1.1.0
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self.serials: Dict[str, int] = {}
+        if path is not None and os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("format") != _FORMAT_VERSION:
+                raise ValueError(f"Unsupported sync state format: {data.get('format')!r}")
+            self.serials = data["serials"]
+
+    def __len__(self) -> int:
+        return len(self.serials)
+
+    def __contains__(self, package_name: object) -> bool:
+        return isinstance(package_name, str) and canonicalize_name(package_name) in self.serials
+
+    def __repr__(self) -> str:
+        return f"<SyncState packages={len(self)} path={self.path!r}>"
+
+    def get(self, package_name: str) -> Optional[int]:
+        return self.serials.get(canonicalize_name(package_name))
+
+    def set(self, package_name: str, serial: int) -> None:
+        self.serials[canonicalize_name(package_name)] = serial
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write the state to ``path`` (Default: the path it was created with), atomically replacing any existing file."""
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path to save the sync state to")
+        _atomic_write(path, json.dumps({"format": _FORMAT_VERSION, "serials": self.serials}).encode())
+
+
+class SyncResult(NamedTuple):
+    """
+    Outcome of syncing a single package with :func:`sync_packages`.
+
+    :param name: Package name, as requested
+    :type name: str
+
+    :param package: The package, or None if syncing it failed
+    :type package: Optional[:class:`~otlet.api.PackageObject`]
+
+    :param serial: Serial of the package as synced, or the previously seen one if syncing failed
+    :type serial: Optional[int]
+
+    :param changed: Whether the package changed since the last sync (or was never synced before), and was refetched
+    :type changed: bool
+
+    :param error: The exception raised while syncing the package, if any
+    :type error: Optional[BaseException]
+
+    .. versionadded:: 1.1.0
+    """
+
+    name: str
+    package: Optional[PackageObject]
+    serial: Optional[int]
+    changed: bool
+    error: Optional[BaseException]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _changelog_serials(changelog: Union[Mapping, Iterable[Tuple]]) -> Dict[str, int]:
+    if isinstance(changelog, Mapping):
+        entries: Iterable[Tuple] = changelog.items()
+    else:
+        # i.e. PyPI's changelog_since_serial(): (name, version, timestamp, action, serial)
+        entries = ((entry[0], entry[-1]) for entry in changelog)
+    serials: Dict[str, int] = {}
+    for name, serial in entries:
+        key = canonicalize_name(name)
+        serials[key] = max(serial, serials.get(key, serial))
+    return serials
+
+
+def _remote_serial(session: Session, name: str) -> Optional[int]:
+    # HEAD the package, as PyPI sends the serial as a header without needing the body
+    res = session.request("HEAD", _package_url(name))
+    _raise_for_status(res, name)
+    serial = res.headers.get("X-PyPI-Last-Serial")
+    return int(serial) if serial and serial.isdigit() else None
+
+
+def _drop_outdated_response(session: Session, name: str, serial: Optional[int]) -> None:
+    # a response cache would otherwise keep serving the previous response until it goes stale
+    cache = getattr(session, "cache", None)
+    if cache is None:
+        return
+    url = _package_url(name)
+    entry = cache.get(url)
+    if entry is not None and (serial is None or entry.last_serial is None or entry.last_serial < serial):
+        cache.delete(url)
+
+
+def _package_from_cache(session: Session, name: str, serial: int, kwargs) -> Optional[PackageObject]:
+    # rebuild an unchanged package from the response cache, without revalidating the entry
+    cache = getattr(session, "cache", None)
+    if cache is None:
+        return None
+    entry = cache.get(_package_url(name))
+    if entry is None or entry.last_serial != serial:
+        return None
+    body = _load_json(entry.body, _RELEASES_KEY if kwargs.get("skip_releases") else None)
+    return PackageObject(name, None, session, http_response=body, **kwargs)
+
+
+def _sync_one(
+    name: str,
+    known: Optional[int],
+    changelog: Optional[Dict[str, int]],
+    session: Session,
+    memo: PackageMemo,
+    kwargs,
+) -> SyncResult:
+    try:
+        key = memo.make_key(name, None, session=session, **memo.key_arguments(kwargs))
+        if changelog is not None:
+            serial = changelog.get(canonicalize_name(name), known)
+        else:
+            serial = _remote_serial(session, name)
+        if serial is not None:
+            if known is not None and serial <= known:
+                package = memo.lookup(key)
+                if package is None:
+                    cached = _package_from_cache(session, name, known, kwargs)
+                    package = memo.add(key, cached) if cached is not None else None
+                if package is not None:
+                    return SyncResult(name, package, known, False, None)
+            else:
+                _drop_outdated_response(session, name, serial)
+        # changed, new or not memoized; when there was no serial to go by, the fetched one decides
+        package = PackageObject(name, None, session, **kwargs)
+        changed = known is None or package.last_serial > known
+        if changed:
+            memo.discard(key)
+        # an unchanged package already in the memo is kept, parsed objects and all
+        package = memo.add(key, package)
+        return SyncResult(name, package, package.last_serial, changed, None)
+    except Exception as err:
+        return SyncResult(name, None, known, False, err)
+
+
+def sync_packages(
+    packages: Iterable[str],
+    state: SyncState,
+    changelog: Optional[Union[Mapping, Iterable[Tuple]]] = None,
+    max_workers: int = 8,
+    session: Optional[Session] = None,
+    memo: Optional[PackageMemo] = None,
+    **kwargs,
+) -> List[SyncResult]:
+    """
+    Bring many packages up to date, refetching only the ones whose ``last_serial`` changed since they were last synced.
+
+    Whether a package changed is checked with a body-less ``HEAD`` request (PyPI sends the package's
+    serial as the ``X-PyPI-Last-Serial`` header), or looked up in ``changelog`` without any request at all.
+    When the header is missing (i.e. behind a proxy that strips it), the package is fetched and its serial compared instead.
+    Unchanged packages are taken from ``memo`` when they are in it, or else rebuilt from the session's
+    :class:`~otlet.cache.ResponseCache` without any request. Changed packages replace any outdated copy in both.
+
+    The memo only lasts as long as the process, and only holds ``maxsize`` packages. To avoid refetching
+    unchanged packages on the next run, or when syncing more packages than that, give ``session`` a
+    :class:`~otlet.cache.ResponseCache`; without one, every unchanged package that isn't memoized is fetched again.
+
+    ``state`` is updated with the serial of every package synced, and saved if it has a ``path``.
+
+    :param packages: Package names
+    :type packages: Iterable[str]
+
+    :param state: Serials seen on the previous sync
+    :type state: :class:`SyncState`
+
+    :param changelog: Serials of every package changed since the previous sync, as a ``{name: serial}``
+        mapping or as entries ending in a serial (i.e. from PyPI's ``changelog_since_serial``);
+        packages not in it are treated as unchanged (optional)
+    :type changelog: Optional[Union[Dict[str, int], Iterable[Tuple]]]
+
+    :param max_workers: Number of packages synced at the same time (Default: 8)
+    :type max_workers: int
+
+    :param session: HTTP session shared by all workers; one sized to ``max_workers`` is used if not given (optional)
+    :type session: :class:`~otlet.session.Session`
+
+    :param memo: Memo of parsed packages to reuse unchanged ones from (Default: :func:`~otlet.memo.get_default_memo`)
+    :type memo: :class:`~otlet.memo.PackageMemo`
+
+    Any other keyword arguments (i.e. ``disregard_extras``) are passed on to :class:`~otlet.api.PackageObject`.
+
+    :return: A :class:`SyncResult` for each package, in the same order as ``packages``
+
+    .. versionadded:: 1.1.0
+    """
+    _session = session or Session(max_connections=max_workers)
+    _memo = memo if memo is not None else get_default_memo()
+    feed = _changelog_serials(changelog) if changelog is not None else None
+    try:
+        names = list(packages)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                executor.map(
+                    lambda name: _sync_one(name, state.get(name), feed, _session, _memo, kwargs),
+                    names,
+                )
+            )
+    finally:
+        if session is None:
+            _session.close()
+
+    for result in results:
+        if result.ok and result.serial is not None:
+            state.set(result.name, result.serial)
+    if state.path is not None:
+        state.save()
+    return results
+
+
+__all__ = ["SyncState", "SyncResult", "sync_packages"]
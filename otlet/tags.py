@@ -0,0 +1,440 @@
+"""
+otlet.tags
+======================
+PEP 425 compatibility tags, for picking the release files that can be installed in an environment.
+"""
+#
+# Copyright (c) 2022 Noah Tanner
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+import re
+import sys
+import platform
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from .api import PackageObject, URLReleaseObject
+from .exceptions import InvalidWheelFilename
+from .markers import DEPENDENCY_ENVIRONMENT_MARKERS, _Environment
+from .memo import canonicalize_name
+
+_WHEEL_FILENAME_REGEX = re.compile(
+    r"^(?P<name>[^-]+)-(?P<version>[^-]+)(?:-(?P<build>[0-9][^-]*))?"
+    r"-(?P<python>[^-]+)-(?P<abi>[^-]+)-(?P<platform>[^-]+)\.whl$"
+)
+_PLATFORM_REGEX = re.compile(r"[^a-z0-9]+")
+_INTERPRETER_ABBREVIATIONS = {"cpython": "cp", "pypy": "pp", "ironpython": "ip", "jython": "jy"}
+_WINDOWS_PLATFORMS = {
+    "amd64": "win_amd64",
+    "x86_64": "win_amd64",
+    "arm64": "win_arm64",
+    "x86": "win32",
+    "i386": "win32",
+    "i686": "win32",
+}
+_MACOS_BINARY_FORMATS = {
+    "x86_64": ("x86_64", "intel", "universal2", "universal"),
+    "arm64": ("arm64", "universal2"),
+}
+# legacy manylinux tags and the glibc version they stand for (PEP 600)
+_MANYLINUX_ALIASES = {
+    (2, 17): ("manylinux2014", frozenset(("x86_64", "i686", "aarch64", "armv7l", "ppc64", "ppc64le", "s390x"))),
+    (2, 12): ("manylinux2010", frozenset(("x86_64", "i686"))),
+    (2, 5): ("manylinux1", frozenset(("x86_64", "i686"))),
+}
+# glibc assumed for Linux environments other than the running one
+_DEFAULT_GLIBC = (2, 17)
+
+
+class Tag(NamedTuple):
+    """
+    A single PEP 425 compatibility tag, i.e. ``('cp311', 'abi3', 'manylinux_2_17_x86_64')``.
+    Tags are interned, so equal tags parsed from different filenames are the same object.
+
+    .. versionadded:: 1.1.0
+    """
+
+    interpreter: str
+    abi: str
+    platform: str
+
+    def __str__(self) -> str:
+        return f"{self.interpreter}-{self.abi}-{self.platform}"
+
+
+class WheelFilename(NamedTuple):
+    """
+    Parsed PEP 427 wheel filename. Should not be directly called, see :func:`parse_wheel_filename`.
+
+    :param name: Distribution name, as written in the filename
+    :type name: str
+
+    :param version: Distribution version
+    :type version: str
+
+    :param build: Build tag, if any
+    :type build: Optional[str]
+
+    :param tags: Every tag the wheel is compatible with (compressed tag sets, i.e. ``py2.py3``, are expanded)
+    :type tags: FrozenSet[:class:`Tag`]
+
+    .. versionadded:: 1.1.0
+    """
+
+    name: str
+    version: str
+    build: Optional[str]
+    tags: FrozenSet[Tag]
+
+
+_interned_tags: Dict[Tuple[str, str, str], Tag] = {}
+
+
+def _tag(interpreter: str, abi: str, platform_: str) -> Tag:
+    key = (interpreter, abi, platform_)
+    tag = _interned_tags.get(key)
+    if tag is None:
+        tag = _interned_tags.setdefault(
+            key, Tag(sys.intern(interpreter), sys.intern(abi), sys.intern(platform_))
+        )
+    return tag
+
+
+@lru_cache(maxsize=4096)
+def _expand_tags(interpreters: str, abis: str, platforms: str) -> FrozenSet[Tag]:
+    return frozenset(
+        _tag(i, a, p)
+        for i in interpreters.split(".")
+        for a in abis.split(".")
+        for p in platforms.split(".")
+    )
+
+
+@lru_cache(maxsize=8192)
+def parse_wheel_filename(filename: str) -> WheelFilename:
+    """
+    Parse a wheel filename, i.e. ``'otlet-1.0.0-py3-none-any.whl'``, into a :class:`WheelFilename`.
+    Results are memoized, so each filename is only parsed once.
+
+    :raises InvalidWheelFilename: if ``filename`` is not a valid wheel filename
+
+    .. versionadded:: 1.1.0
+    """
+    match = _WHEEL_FILENAME_REGEX.match(filename)
+    if not match:
+        raise InvalidWheelFilename(filename)
+    return WheelFilename(
+        match.group("name"),
+        match.group("version"),
+        match.group("build"),
+        _expand_tags(match.group("python"), match.group("abi"), match.group("platform")),
+    )
+
+
+class SupportedTags:
+    """
+    Ordered set of the tags supported by an environment, most preferred first. Should not be directly called,
+    see :func:`supported_tags`.
+
+    :var tags: Supported tags, most preferred first
+    :vartype tags: Tuple[:class:`Tag`, ...]
+
+    .. versionadded:: 1.1.0
+    """
+
+    __slots__ = ("tags", "_ranks")
+
+    def __init__(self, tags: Iterable[Tag]) -> None:
+        ordered: List[Tag] = []
+        self._ranks: Dict[Tag, int] = {}
+        for tag in tags:
+            if tag not in self._ranks:
+                self._ranks[tag] = len(ordered)
+                ordered.append(tag)
+        self.tags = tuple(ordered)
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    def __iter__(self) -> Iterator[Tag]:
+        return iter(self.tags)
+
+    def __contains__(self, tag: object) -> bool:
+        return tag in self._ranks
+
+    def __repr__(self) -> str:
+        return f"<SupportedTags ({len(self)} tags, best: {self.tags[0] if self.tags else None})>"
+
+    def rank(self, tags: Iterable[Tag]) -> Optional[int]:
+        """Rank of the most preferred of ``tags`` (lower is better), or None if none of them are supported."""
+        ranks = self._ranks
+        best = None
+        for tag in tags:
+            rank = ranks.get(tag)
+            if rank is not None and (best is None or rank < best):
+                best = rank
+        return best
+
+
+def supported_tags(
+    environment: Optional[Mapping[str, Any]] = None,
+    platforms: Optional[Sequence[str]] = None,
+) -> SupportedTags:
+    """
+    Compute the tags supported by an environment, most preferred first, in the same order pip uses.
+    Results are cached per environment.
+
+    The interpreter and platform are derived from the environment's markers (``implementation_name``,
+    ``python_version``, ``sys_platform``, ``platform_machine`` and, on macOS, ``platform_release``);
+    any marker it leaves out takes its value from :data:`~otlet.markers.DEPENDENCY_ENVIRONMENT_MARKERS`.
+    Linux environments other than the running one are assumed to have glibc 2.17 (``manylinux2014``),
+    and ABI-specific tags are only generated for CPython.
+
+    :param environment: Environment markers (Default: the running environment)
+    :type environment: Optional[Dict[str, Any]]
+
+    :param platforms: Platform tags to use instead of the derived ones, most preferred first (optional)
+    :type platforms: Optional[List[str]]
+
+    .. versionadded:: 1.1.0
+    """
+    env = environment if isinstance(environment, _Environment) else _Environment(environment or {})
+    return _supported_tags(env.key, tuple(platforms) if platforms is not None else None)
+
+
+@lru_cache(maxsize=64)
+def _supported_tags(
+    environment_key: Tuple[Tuple[str, str], ...], platforms: Optional[Tuple[str, ...]]
+) -> SupportedTags:
+    env = dict(environment_key)
+    if platforms is None:
+        platforms = tuple(_platform_tags(env))
+    return SupportedTags(_generate_tags(env, platforms))
+
+
+def _generate_tags(env: Mapping[str, str], platforms: Sequence[str]) -> Iterator[Tag]:
+    implementation = env["implementation_name"]
+    prefix = _INTERPRETER_ABBREVIATIONS.get(implementation, implementation)
+    major, minor = (int(p) for p in env["python_version"].split(".")[:2])
+    interpreter = f"{prefix}{major}{minor}"
+
+    if prefix == "cp":
+        abis = [f"cp{major}{minor}m" if (major, minor) < (3, 8) else interpreter]
+        if (major, minor) >= (3, 2):
+            abis.append("abi3")
+        abis.append("none")
+        for abi in abis:
+            for platform_ in platforms:
+                yield _tag(interpreter, abi, platform_)
+        if major >= 3:
+            for older in range(minor - 1, 1, -1):
+                for platform_ in platforms:
+                    yield _tag(f"cp{major}{older}", "abi3", platform_)
+    else:
+        for platform_ in platforms:
+            yield _tag(interpreter, "none", platform_)
+
+    pythons = [f"py{major}{minor}", f"py{major}"] + [f"py{major}{m}" for m in range(minor - 1, -1, -1)]
+    for python in pythons:
+        for platform_ in platforms:
+            yield _tag(python, "none", platform_)
+    yield _tag(interpreter, "none", "any")
+    for python in pythons:
+        yield _tag(python, "none", "any")
+
+
+def _platform_tags(env: Mapping[str, str]) -> List[str]:
+    system = env["sys_platform"]
+    machine = env["platform_machine"].lower()
+    if system.startswith("linux"):
+        return _linux_platforms(machine, _glibc_version(env))
+    if system == "darwin":
+        return _macos_platforms(machine, env["platform_release"])
+    if system == "win32":
+        return [_WINDOWS_PLATFORMS.get(machine, "win32")]
+    return [_PLATFORM_REGEX.sub("_", f"{system}_{machine}".lower())]
+
+
+def _linux_platforms(machine: str, glibc: Optional[Tuple[int, int]]) -> List[str]:
+    platforms = []
+    if glibc is not None:
+        major, max_minor = glibc
+        for minor in range(max_minor, 4, -1):
+            platforms.append(f"manylinux_{major}_{minor}_{machine}")
+            alias, machines = _MANYLINUX_ALIASES.get((major, minor), (None, ()))
+            if machine in machines:
+                platforms.append(f"{alias}_{machine}")
+    platforms.append(f"linux_{machine}")
+    return platforms
+
+
+def _glibc_version(env: Mapping[str, str]) -> Optional[Tuple[int, int]]:
+    if (env["sys_platform"], env["platform_machine"]) == (
+        DEPENDENCY_ENVIRONMENT_MARKERS["sys_platform"],
+        DEPENDENCY_ENVIRONMENT_MARKERS["platform_machine"],
+    ):
+        return _running_glibc_version()
+    return _DEFAULT_GLIBC
+
+
+@lru_cache(maxsize=None)
+def _running_glibc_version() -> Optional[Tuple[int, int]]:
+    library, version = platform.libc_ver()
+    if library != "glibc":
+        return None
+    try:
+        major, minor = version.split(".")[:2]
+        return int(major), int(minor)
+    except ValueError:
+        return None
+
+
+def _macos_platforms(machine: str, release: str) -> List[str]:
+    try:
+        darwin = int(release.split(".")[0])
+    except ValueError:
+        darwin = 20
+    if darwin >= 20:
+        # darwin 20 is macOS 11; macOS jumped from 15 (darwin 24) to 26 (darwin 25)
+        major = darwin - 9 if darwin < 25 else darwin + 1
+        versions = [(m, 0) for m in range(major, 10, -1)]
+        if machine != "arm64":
+            versions.extend((10, m) for m in range(16, -1, -1))
+    else:
+        versions = [(10, m) for m in range(darwin - 4, -1, -1)]
+    return [
+        f"macosx_{a}_{b}_{binary_format}"
+        for a, b in versions
+        for binary_format in _MACOS_BINARY_FORMATS.get(machine, (machine,))
+    ]
+
+
+def rank_files(
+    files: Iterable[URLReleaseObject],
+    environment: Optional[Mapping[str, Any]] = None,
+    include_sdist: bool = True,
+) -> List[URLReleaseObject]:
+    """
+    Order release files by how well they suit an environment, in a single pass over them.
+    Wheels that can't be installed in the environment are left out; source distributions come after every wheel.
+
+    :param files: Release files, i.e. :attr:`~otlet.api.PackageObject.urls`
+    :type files: Iterable[:class:`~otlet.api.URLReleaseObject`]
+
+    :param environment: Environment markers, see :func:`supported_tags` (Default: the running environment)
+    :type environment: Optional[Dict[str, Any]]
+
+    :param include_sdist: Whether to include source distributions (Default: True)
+    :type include_sdist: bool
+
+    .. versionadded:: 1.1.0
+    """
+    supported = supported_tags(environment)
+    sdist_rank = len(supported)
+    ranked = []
+    for position, file in enumerate(files):
+        filename = file.filename
+        if filename.endswith(".whl"):
+            try:
+                rank = supported.rank(parse_wheel_filename(filename).tags)
+            except InvalidWheelFilename:
+                continue
+            if rank is None:
+                continue
+        elif include_sdist and file.packagetype == "sdist":
+            rank = sdist_rank
+        else:
+            continue
+        ranked.append((rank, position, file))
+    ranked.sort(key=lambda r: r[:2])
+    return [file for _, _, file in ranked]
+
+
+# (package name, version, environment, include_sdist) -> ranked files, least recently used first
+_selections: "OrderedDict[Tuple[str, str, Tuple, bool], Tuple[URLReleaseObject, ...]]" = OrderedDict()
+_selections_lock = threading.Lock()
+_MAX_SELECTIONS = 1024
+
+
+def select_files(
+    package: PackageObject,
+    version: Optional[str] = None,
+    environment: Optional[Mapping[str, Any]] = None,
+    include_sdist: bool = True,
+) -> List[URLReleaseObject]:
+    """
+    Files of one release of a package that can be installed in an environment, best first (see :func:`rank_files`).
+    Taken from the already fetched package, without any further requests, and cached per
+    (package, version, environment).
+
+    :param package: Package to select files from
+    :type package: :class:`~otlet.api.PackageObject`
+
+    :param version: Release to select files from; other than the package's own release, this needs its
+        ``releases`` (Default: the package's own release)
+    :type version: Optional[str]
+
+    :param environment: Environment markers, see :func:`supported_tags` (Default: the running environment)
+    :type environment: Optional[Dict[str, Any]]
+
+    :param include_sdist: Whether to include source distributions (Default: True)
+    :type include_sdist: bool
+
+    .. versionadded:: 1.1.0
+    """
+    env = _Environment(environment or {})
+    version = version or package.version
+    key = (canonicalize_name(package.name), version, env.key, include_sdist)
+    with _selections_lock:
+        files = _selections.get(key)
+        if files is not None:
+            _selections.move_to_end(key)
+    if files is None:
+        release_files = package.urls if version == package.version else package.releases.files(version)
+        files = tuple(rank_files(release_files, env, include_sdist))
+        with _selections_lock:
+            _selections[key] = files
+            if len(_selections) > _MAX_SELECTIONS:
+                _selections.popitem(last=False)
+    return list(files)
+
+
+__all__ = [
+    "Tag",
+    "WheelFilename",
+    "SupportedTags",
+    "parse_wheel_filename",
+    "supported_tags",
+    "rank_files",
+    "select_files",
+]
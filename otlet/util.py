@@ -24,8 +24,14 @@ Utility functions for otlet. All functions in this module are NOT considered par
 # OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
 # OR OTHER DEALINGS IN THE SOFTWARE.
 
+import os
+import calendar
+import datetime
+import tempfile
 from warnings import warn
 
+_EPOCH = datetime.datetime(1970, 1, 1)
+
 
 def _deprecated(deprecated_version, extra=""):
     """Simple decorator for deprecated functions and methods."""
@@ -39,3 +45,77 @@ def _deprecated(deprecated_version, extra=""):
         return f
 
     return print_message
+
+
+class _cached_property:
+    """Property computed on first access and then stored on the instance (i.e. ``functools.cached_property``, which needs Python 3.8)."""
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.func(instance)
+        return value
+
+
+# upload times from the API are 'YYYY-MM-DDTHH:MM:SS', optionally followed by fractional seconds
+# and/or a 'Z' (UTC either way); only the first 19 characters are needed
+if hasattr(datetime.datetime, "fromisoformat"):  # Python 3.7+
+
+    def _parse_upload_time(value: str) -> datetime.datetime:
+        """Parse a PyPI upload timestamp into a naive (UTC) datetime."""
+        return datetime.datetime.fromisoformat(value[:19])
+
+    def _upload_timestamp(value: str) -> int:
+        """Parse a PyPI upload timestamp into seconds since the Unix epoch."""
+        # the C parser beats slicing the fields out in Python; only the timedelta division is skipped
+        delta = datetime.datetime.fromisoformat(value[:19]) - _EPOCH
+        return delta.days * 86400 + delta.seconds
+
+
+else:
+
+    def _parse_upload_time(value: str) -> datetime.datetime:
+        """Parse a PyPI upload timestamp into a naive (UTC) datetime."""
+        return datetime.datetime(
+            int(value[0:4]),
+            int(value[5:7]),
+            int(value[8:10]),
+            int(value[11:13]),
+            int(value[14:16]),
+            int(value[17:19]),
+        )
+
+    def _upload_timestamp(value: str) -> int:
+        """Parse a PyPI upload timestamp into seconds since the Unix epoch."""
+        return calendar.timegm(
+            (
+                int(value[0:4]),
+                int(value[5:7]),
+                int(value[8:10]),
+                int(value[11:13]),
+                int(value[14:16]),
+                int(value[17:19]),
+            )
+        )
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write ``data`` to ``path`` through a temporary file and a rename, so readers never see a partial file."""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,206 @@
+"""
+otlet.vulnerabilities
+======================
+Index of known vulnerabilities across many packages, for checking pinned versions in bulk.
+"""
+#
+# Copyright (c) 2022 Noah Tanner
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+# OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
+
+import json
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+from .api import PackageObject, PackageVulnerabilitiesObject
+from .memo import canonicalize_name
+from .packaging.specifiers import _next_series
+from .packaging.version import Version, version_sort_key
+from .util import _atomic_write
+
+_FORMAT_VERSION = 1
+
+# (start, end) of a range of vulnerable versions as sort keys; None stands for no bound
+_Range = Tuple[Optional[tuple], Optional[tuple]]
+
+
+def _vulnerable_ranges(fixed_in: List) -> List[_Range]:
+    # every version before the first fix is affected; after a fix, the rest of its release
+    # series is fixed (i.e. 3.2.13 fixes 3.2.x), but not the versions up to the next fix
+    if not fixed_in:
+        return [(None, None)]
+    fixes = sorted(fixed_in, key=version_sort_key)
+    ranges: List[_Range] = [(None, version_sort_key(fixes[0]))]
+    for fix, next_fix in zip(fixes, fixes[1:]):
+        if not isinstance(fix, Version) or len(fix.release) < 2:
+            continue
+        start = _next_series(fix.epoch, fix.release[:-1])
+        end = version_sort_key(next_fix)
+        if start < end:
+            ranges.append((start, end))
+    return ranges
+
+
+class _PackageAdvisories:
+    # advisories of a single package, split into segments of the version axis that are each
+    # affected by the same advisories, so any version is looked up with one binary search
+
+    __slots__ = ("advisories", "_points", "_segments")
+
+    def __init__(self) -> None:
+        self.advisories: Dict[str, PackageVulnerabilitiesObject] = {}
+        self._points: Optional[List[tuple]] = None
+        self._segments: List[Tuple[PackageVulnerabilitiesObject, ...]] = []
+
+    def add(self, advisory: PackageVulnerabilitiesObject) -> None:
+        self.advisories[advisory.id] = advisory
+        self._points = None
+
+    def _build(self) -> None:
+        ranges = [(a, r) for a in self.advisories.values() for r in _vulnerable_ranges(a.fixed_in)]
+        points = sorted({key for _, r in ranges for key in r if key is not None})
+        # segment i spans [points[i - 1], points[i]), with the first and last unbounded
+        segments: List[List[PackageVulnerabilitiesObject]] = [[] for _ in range(len(points) + 1)]
+        for advisory, (start, end) in ranges:
+            first = 0 if start is None else bisect_left(points, start) + 1
+            last = len(points) if end is None else bisect_left(points, end)
+            for i in range(first, last + 1):
+                if not segments[i] or segments[i][-1] is not advisory:
+                    segments[i].append(advisory)
+        self._segments = [tuple(s) for s in segments]
+        self._points = points
+
+    def affecting(self, key: tuple) -> Tuple[PackageVulnerabilitiesObject, ...]:
+        if self._points is None:
+            self._build()
+        return self._segments[bisect_right(self._points, key)]  # type: ignore
+
+
+class VulnerabilityIndex:
+    """
+    Advisories aggregated from fetched packages, keyed by canonicalized package name.
+
+    Which versions an advisory affects is worked out from its ``fixed_in`` versions: every version
+    before the first fix is affected, and so is every version after the release series of one fix
+    (i.e. ``3.2.x`` for a fix in ``3.2.13``) and before the next fix. Advisories without any fix
+    affect every version. These ranges are sorted once per package, so checking a pinned version
+    takes a single binary search however many advisories its package has.
+
+    .. versionadded:: 1.1.0
+    """
+
+    def __init__(self) -> None:
+        self._packages: Dict[str, _PackageAdvisories] = {}
+
+    def __len__(self) -> int:
+        return len(self._packages)
+
+    def __contains__(self, package_name: object) -> bool:
+        return isinstance(package_name, str) and canonicalize_name(package_name) in self._packages
+
+    def __repr__(self) -> str:
+        count = sum(len(p.advisories) for p in self._packages.values())
+        return f"<VulnerabilityIndex packages={len(self)} advisories={count}>"
+
+    def add(self, package_name: str, advisories: Iterable[PackageVulnerabilitiesObject]) -> None:
+        """Add advisories for a package, replacing any already indexed under the same ``id``."""
+        entry = self._packages.setdefault(canonicalize_name(package_name), _PackageAdvisories())
+        for advisory in advisories:
+            entry.add(advisory)
+
+    def add_package(self, package: PackageObject) -> None:
+        """Add the advisories of an already fetched :class:`~otlet.api.PackageObject`."""
+        self.add(package.name, package.vulnerabilities or ())
+
+    @classmethod
+    def from_packages(cls, packages: Iterable[PackageObject]) -> "VulnerabilityIndex":
+        """Build an index from already fetched packages, i.e. the results of :func:`~otlet.bulk.fetch_many`."""
+        index = cls()
+        for package in packages:
+            index.add_package(package)
+        return index
+
+    def advisories(self, package_name: str) -> List[PackageVulnerabilitiesObject]:
+        """Every advisory indexed for a package."""
+        entry = self._packages.get(canonicalize_name(package_name))
+        return list(entry.advisories.values()) if entry else []
+
+    def affecting(self, package_name: str, version: str) -> List[PackageVulnerabilitiesObject]:
+        """Advisories affecting one version of a package."""
+        entry = self._packages.get(canonicalize_name(package_name))
+        if entry is None:
+            return []
+        return list(entry.affecting(version_sort_key(version)))
+
+    def query(
+        self, pins: Iterable[Tuple[str, str]]
+    ) -> Dict[Tuple[str, str], List[PackageVulnerabilitiesObject]]:
+        """
+        Check many pinned versions at once.
+
+        :param pins: ``(package name, version)`` pairs
+        :type pins: Iterable[Tuple[str, str]]
+
+        :return: Advisories affecting each vulnerable pin; pins not affected by any advisory are left out
+        """
+        packages = self._packages
+        vulnerable = {}
+        for name, version in pins:
+            entry = packages.get(canonicalize_name(name))
+            if entry is None:
+                continue
+            found = entry.affecting(version_sort_key(version))
+            if found:
+                vulnerable[(name, version)] = list(found)
+        return vulnerable
+
+    def save(self, path: str) -> None:
+        """Write the index to a JSON file, atomically replacing any existing one."""
+        data = {
+            "format": _FORMAT_VERSION,
+            "packages": {
+                name: [
+                    {
+                        "aliases": a.aliases,
+                        "details": a.details,
+                        "fixed_in": [str(v) for v in a.fixed_in],
+                        "id": a.id,
+                        "link": a.link,
+                        "source": a.source,
+                    }
+                    for a in entry.advisories.values()
+                ]
+                for name, entry in self._packages.items()
+            },
+        }
+        _atomic_write(path, json.dumps(data).encode())
+
+    @classmethod
+    def load(cls, path: str) -> "VulnerabilityIndex":
+        """Read an index written by :meth:`save`."""
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("format") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported vulnerability index format: {data.get('format')!r}")
+        index = cls()
+        for name, advisories in data["packages"].items():
+            index.add(name, (PackageVulnerabilitiesObject.construct(a) for a in advisories))
+        return index
+
+
+__all__ = ["VulnerabilityIndex"]
@@ -1,5 +1,15 @@
+import asyncio
+import datetime
+import json
+import os
 import pytest
 from otlet import *
+from otlet.packaging.version import Version
+
+# static copy of PyPI's response for otlet-test-project, for tests that only need realistic data
+with open(os.path.join(os.path.dirname(__file__), "fixtures", "otlet-test-project.json")) as f:
+    TEST_PROJECT = json.load(f)
+TEST_FILE = TEST_PROJECT["releases"]["0.0.1"][0]
 
 ### otlet.api.PackageObject ###
 
@@ -29,4 +39,522 @@ def test_packagedependencyobject_populate() -> bool:
     _pdotpkg.dependencies[-1].populate(0)
 def test_packagedependencyobject_propertyfail() -> bool:
     with pytest.raises(NotPopulatedError):
-        _pdotpkg.dependencies[0].version
\ No newline at end of file
+        _pdotpkg.dependencies[0].version
+
+### otlet.session.Session ###
+
+def test_session_reuses_connection() -> bool:
+    with Session() as session:
+        pkg = PackageObject("otlet-test-project", session=session)
+        assert pkg.session is session
+        assert pkg.dependencies[0].session is session
+        PackageInfoObject("otlet-test-project", session=session)
+        assert sum(len(conns) for conns in session._pool.values()) == 1
+
+def test_session_timeout_closes_connection() -> bool:
+    import socket
+    import threading
+
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    accepted = []
+    threading.Thread(target=lambda: accepted.append(server.accept()[0]), daemon=True).start()
+    session = Session(timeout=0.1)
+    try:
+        with pytest.raises(OSError) as err:
+            session.get(f"http://127.0.0.1:{server.getsockname()[1]}/")
+        assert not session._pool
+        # a read only returns once the client closed its end (and not through garbage
+        # collection, as the traceback keeps the client's connection alive)
+        accepted[0].settimeout(1)
+        assert accepted[0].recv(4096).startswith(b"GET / HTTP/1.1") and accepted[0].recv(4096) == b""
+        assert err.traceback
+    finally:
+        for conn in accepted:
+            conn.close()
+        server.close()
+
+### otlet.cache.ResponseCache ###
+
+def test_responsecache_serves_fresh_entries(tmp_path) -> bool:
+    cache = ResponseCache(str(tmp_path))
+    session = Session(cache=cache)
+    pkg = PackageObject("otlet-test-project", session=session)
+    entry = cache.get(f"{PYPI_URL}/pypi/otlet-test-project/json")
+    assert entry is not None and cache.is_fresh(entry)
+    session.close()
+    cached = PackageObject("otlet-test-project", session=session)
+    assert cached.http_response == pkg.http_response
+    assert not session._pool
+def test_responsecache_prune(tmp_path) -> bool:
+    cache = ResponseCache(str(tmp_path))
+    cache.store("https://example.org/a", b"0123456789")
+    cache.store("https://example.org/b", b"0123456789")
+    cache.max_size = max(
+        os.path.getsize(cache._path(f"https://example.org/{u}"))
+        + os.path.getsize(cache._path(f"https://example.org/{u}") + ".meta")
+        for u in "ab"
+    )
+    cache.prune()
+    assert len([u for u in "ab" if cache.get(f"https://example.org/{u}")]) == 1
+def test_responsecache_refresh_and_clear(tmp_path) -> bool:
+    cache = ResponseCache(str(tmp_path))
+    entry = cache.store("https://example.org/a", b"0123456789", etag='"x"')
+    body_inode = os.stat(cache._path(entry.url)).st_ino
+    refreshed = cache.refresh(entry._replace(stored_at=0))
+    assert refreshed.stored_at > 0 and cache.get(entry.url).stored_at == refreshed.stored_at
+    assert os.stat(cache._path(entry.url)).st_ino == body_inode  # body not rewritten
+    (tmp_path / "notes.txt").write_text("keep")
+    (tmp_path / "ab").mkdir(exist_ok=True)
+    (tmp_path / "ab" / "notes.txt").write_text("keep")
+    cache.clear()
+    assert cache.get(entry.url) is None
+    assert (tmp_path / "notes.txt").exists() and (tmp_path / "ab" / "notes.txt").exists()
+
+### otlet.memo.PackageMemo ###
+
+def test_packagememo_hit() -> bool:
+    memo = PackageMemo(maxsize=1)
+    pkg = memo.get("otlet-test-project")
+    assert memo.get("Otlet_Test.Project") is pkg
+    assert (memo.hits, memo.misses) == (1, 1)
+    memo.clear()
+    assert len(memo) == 0 and memo.hits == 0
+    raw = PackageMemo().get("otlet-test-project", raw_timestamps=True)
+    assert isinstance(raw.upload_time, int)
+def test_packagememo_sources_and_ttl(tmp_path) -> bool:
+    from otlet.mirror import MirrorSource
+
+    memo = PackageMemo(ttl=60)
+    key = memo.make_key("otlet-test-project", "0.0.1")
+    assert key == memo.make_key("otlet-test-project", "0.0.1", session=Session())
+    assert key != memo.make_key("otlet-test-project", "0.0.1", session=MirrorSource(str(tmp_path)))
+    pkg = memo.add(key, object())
+    assert memo.lookup(key) is pkg and memo.add(key, object()) is pkg
+    expired = PackageMemo(ttl=0)
+    expired.add(key, pkg)
+    assert expired.lookup(key) is None and len(expired) == 0
+
+### otlet.aio ###
+
+def test_asyncpackageobject_await() -> bool:
+    from otlet.aio import AsyncSession, AsyncPackageObject, AsyncPackageInfoObject
+
+    async def fetch():
+        async with AsyncSession(concurrency=2) as session:
+            return await asyncio.gather(
+                AsyncPackageObject("otlet-test-project", session=session),
+                AsyncPackageInfoObject("otlet-test-project", session=session),
+            )
+
+    loop = asyncio.new_event_loop()
+    try:
+        pkg, info = loop.run_until_complete(fetch())
+    finally:
+        loop.close()
+    assert pkg.version == str(info.version)
+    assert pkg.dependency_count == len(info.requires_dist)
+def test_asyncsession_connect_timeout(monkeypatch) -> bool:
+    from otlet.aio import AsyncSession
+
+    async def unresponsive_host(*args, **kwargs):
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(asyncio, "open_connection", unresponsive_host)
+
+    async def fetch():
+        async with AsyncSession(timeout=0.1) as session:
+            with pytest.raises(asyncio.TimeoutError):
+                await session.get("http://127.0.0.1:1/")
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(asyncio.wait_for(fetch(), 5))
+    finally:
+        loop.close()
+def test_asyncsession_timeout_closes_connection() -> bool:
+    from otlet.aio import AsyncSession
+
+    async def fetch():
+        connections = []  # never answered
+        server = await asyncio.start_server(lambda *stream: connections.append(stream), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        session = AsyncSession(timeout=0.1)
+        try:
+            with pytest.raises(asyncio.TimeoutError) as err:
+                await session.get(f"http://127.0.0.1:{port}/")
+            assert not session._pool
+            # reading to EOF only finishes once the client closed its end (and not through garbage
+            # collection, as the traceback keeps the client's stream alive)
+            assert (await asyncio.wait_for(connections[0][0].read(), 1)).startswith(b"GET / HTTP/1.1")
+            assert err.traceback
+        finally:
+            await session.close()
+            server.close()
+            await server.wait_closed()
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(fetch())
+    finally:
+        loop.close()
+
+### otlet.bulk.fetch_many ###
+
+def test_fetch_many_ordered() -> bool:
+    names = [
+        "otlet-test-project",
+        "thispackagedoesnotexistinthepypirepository123456789",
+        ("otlet", None),
+    ]
+    results = list(fetch_many(names, max_workers=3, ordered=True))
+    assert [r.name for r in results] == ["otlet-test-project", names[1], "otlet"]
+    assert results[0].ok and results[2].ok
+    assert isinstance(results[1].error, PyPIPackageNotFound)
+
+### otlet.resolver ###
+
+def test_resolve_root_only() -> bool:
+    graph = resolve("otlet-test-project", max_depth=0)
+    assert graph.root == ("otlet-test-project", graph.nodes[graph.root].package.version)
+    assert len(graph) == 1 and not graph.edges
+def test_dependencygraph_cycles() -> bool:
+    a, b, c = ("a", "1"), ("b", "1"), ("c", "1")
+    graph = DependencyGraph(DependencyNode(a, None, 0))
+    graph.nodes[b] = DependencyNode(b, None, 1)
+    graph.nodes[c] = DependencyNode(c, None, 2)
+    graph.edges = [DependencyEdge(a, b, None), DependencyEdge(b, c, None), DependencyEdge(c, a, None)]
+    assert graph._find_cycles() == [[a, b, c, a]]
+
+### lazy PackageObject attributes ###
+
+def test_packageobject_lazy_attributes() -> bool:
+    pkg = PackageObject("otlet-test-project")
+    assert not {"info", "releases", "urls", "vulnerabilities"} & set(pkg.__dict__)
+    assert pkg.releases is pkg.releases
+    assert "releases" in pkg.__dict__ and "info" not in pkg.__dict__
+
+### otlet.releases.ReleaseTable ###
+
+def test_releasetable_matches_construct() -> bool:
+    pkg = PackageObject("otlet-test-project", http_response=TEST_PROJECT)
+    raw = pkg.http_response["releases"]
+    assert list(pkg.releases) == [k for k, v in raw.items() if v]
+    for version, release in pkg.releases.items():
+        assert release == URLReleaseObject.construct(raw[version][0])
+
+def test_releasetable_tag_index() -> bool:
+    item = TEST_FILE
+    def files(version, *names):
+        return [
+            dict(item, filename=n, packagetype="bdist_wheel", python_version=n.split("-")[2]) if n.endswith(".whl")
+            else dict(item, filename=n, packagetype="sdist", python_version="source")
+            for n in names
+        ]
+    table = ReleaseTable({
+        "1.0": files("1.0", "x-1.0.tar.gz", "x-1.0-py2.py3-none-any.whl"),
+        "2.0": files("2.0", "x-2.0.tar.gz", "x-2.0-cp311-cp311-manylinux_2_17_x86_64.manylinux2014_x86_64.whl", "x-2.0-cp311-cp311-win_amd64.whl"),
+        "3.0": files("3.0", "x-3.0-cp312-cp312-manylinux2014_x86_64.whl"),
+    })
+    assert table["2.0"].filename == "x-2.0.tar.gz" and len(table.files("2.0")) == 3
+    assert table.versions_with("bdist_wheel", "cp311", "manylinux2014_x86_64") == ["2.0"]
+    assert table.versions_with(platform_tag=["manylinux2014_x86_64", "any"]) == ["1.0", "2.0", "3.0"]
+    assert table.versions_with(python_tag="py3") == ["1.0"] and table.versions_with("sdist") == ["1.0", "2.0"]
+    assert [(v, f.filename) for v, f in table.find_files(platform_tag="win_amd64")] == [("2.0", "x-2.0-cp311-cp311-win_amd64.whl")]
+    assert table.versions_with(abi_tag="cp311") == ["2.0"] and table.versions_with(abi_tag=["none", "cp312"]) == ["1.0", "3.0"]
+
+### otlet.tags ###
+
+def test_tags_rank_files() -> bool:
+    wheel = parse_wheel_filename("x-1.0-1-cp311-abi3-manylinux_2_17_x86_64.manylinux2014_x86_64.whl")
+    assert wheel.build == "1" and Tag("cp311", "abi3", "manylinux2014_x86_64") in wheel.tags
+    tag = next(iter(parse_wheel_filename("y-2.0-cp311-abi3-manylinux2014_x86_64.whl").tags))
+    assert any(t is tag for t in wheel.tags)
+    with pytest.raises(InvalidWheelFilename):
+        parse_wheel_filename("x-1.0.tar.gz")
+    env = {"sys_platform": "linux", "platform_machine": "x86_64", "implementation_name": "cpython", "python_version": "3.11"}
+    supported = supported_tags(env)
+    assert supported is supported_tags(env) and supported.tags[0][:2] == ("cp311", "cp311")
+    assert Tag("cp311", "cp311", "manylinux2014_x86_64") in supported and Tag("cp311", "cp311", "win_amd64") not in supported
+    item = TEST_FILE
+    names = ["x-1.0.tar.gz", "x-1.0-py3-none-any.whl", "x-1.0-cp311-cp311-win_amd64.whl", "x-1.0-cp311-cp311-manylinux2014_x86_64.whl"]
+    files = [URLReleaseObject.construct(dict(item, filename=n, packagetype="sdist" if n.endswith("gz") else "bdist_wheel")) for n in names]
+    assert [f.filename for f in rank_files(files, env)] == [names[3], names[1], names[0]]
+    assert [f.filename for f in rank_files(files, dict(env, sys_platform="win32", platform_machine="AMD64"), False)] == [names[2], names[1]]
+    pkg = PackageObject("otlet-test-project", http_response=TEST_PROJECT)
+    selected = select_files(pkg, environment=env)
+    assert selected == rank_files(pkg.urls, env) and select_files(pkg, environment=env) == selected
+
+### otlet.vulnerabilities.VulnerabilityIndex ###
+
+def test_vulnerabilityindex_query(tmp_path) -> bool:
+    def advisory(id, fixed_in):
+        return PackageVulnerabilitiesObject.construct(
+            {"aliases": [], "details": "", "fixed_in": fixed_in, "id": id, "link": "", "source": "osv"}
+        )
+    index = VulnerabilityIndex()
+    index.add("Django", [advisory("PYSEC-1", ["3.2.13", "4.0.4", "2.2.28"]), advisory("PYSEC-2", ["4.1"])])
+    index.add("unfixed_pkg", [advisory("PYSEC-3", [])])
+    assert "django" in index and [a.id for a in index.affecting("django", "4.0.3")] == ["PYSEC-1", "PYSEC-2"]
+    pins = [("Django", "2.2.27"), ("Django", "2.2.28"), ("Django", "3.1"), ("django", "3.2.20"), ("Django", "4.1"), ("Unfixed-Pkg", "9.9"), ("six", "1.0")]
+    vulnerable = index.query(pins)
+    assert {pin: [a.id for a in found] for pin, found in vulnerable.items()} == {
+        ("Django", "2.2.27"): ["PYSEC-1", "PYSEC-2"],
+        ("Django", "2.2.28"): ["PYSEC-2"],
+        ("Django", "3.1"): ["PYSEC-1", "PYSEC-2"],
+        ("django", "3.2.20"): ["PYSEC-2"],
+        ("Unfixed-Pkg", "9.9"): ["PYSEC-3"],
+    }
+    index.save(str(tmp_path / "vulns.json"))
+    assert VulnerabilityIndex.load(str(tmp_path / "vulns.json")).query(pins) == vulnerable
+
+### otlet.requirements ###
+
+def test_parse_requirement() -> bool:
+    req = parse_requirement('sphinx[lint, docs] (>= 5.0.2, <6.0.0); python_version >= "3.7"')
+    assert (req.name, req.extras, req.specifier) == ("sphinx", ("lint", "docs"), ">=5.0.2,<6.0.0")
+    assert req.marker == 'python_version >= "3.7"' and req.key == "sphinx[lint,docs]"
+    assert parse_requirement("coverage[toml]>=5.0.2").specifier == ">=5.0.2"
+    assert parse_requirement("pip @ https://example.org/pip.whl").url == "https://example.org/pip.whl"
+    assert parse_requirement("six>=1.5") is parse_requirement("six>=1.5")
+    with pytest.raises(InvalidRequirement):
+        parse_requirement("six >=> 1.5")
+def test_unparsable_requirements_skipped() -> bool:
+    response = dict(TEST_PROJECT, info=dict(TEST_PROJECT["info"], requires_dist=["foo (1.0)", "six>=1.5", 'bar; python_version >']))
+    with pytest.warns(UserWarning) as skipped:
+        info = PackageInfoObject("otlet-test-project", perform_request=False, http_response=response)
+    assert ["foo (1.0)" in str(w.message) for w in skipped] == [True, False]
+    assert [(d.name, d.version_constraints) for d in info.requires_dist] == [("six", [">=1.5"])]
+
+### otlet.markers ###
+
+def test_compile_marker() -> bool:
+    marker = compile_marker('python_version >= "3.6" and (os_name == "fakeos" or extra == "Docs")')
+    assert marker is compile_marker('python_version >= "3.6" and (os_name == "fakeos" or extra == "Docs")')
+    assert not marker.evaluate() and marker.evaluate(extras=["docs"])
+    assert marker.evaluate({"python_version": "3.8", "os_name": "fakeos"})
+    assert not marker.evaluate({"python_version": "2.7", "os_name": "fakeos"})
+    assert compile_marker('python_full_version ~= "3.1"').evaluate({"python_full_version": "3.11.2"})
+    # a partial environment takes the rest of its values from the defaults
+    partial = compile_marker('python_version >= "3.8" and sys_platform == "fakeplatform"')
+    assert not partial.evaluate({"python_version": "3.9"})
+    assert partial.evaluate({"python_version": "3.9", "sys_platform": "fakeplatform"})
+    with pytest.raises(InvalidMarker):
+        compile_marker('python_version >= "3.6" and')
+
+def test_dependencies_for_environments() -> bool:
+    info = PackageInfoObject(
+        "fake",
+        perform_request=False,
+        http_response={
+            "info": {
+                "name": "fake",
+                "version": "1.0",
+                "requires_dist": [
+                    'tomli; python_version < "3.11"',
+                    'colorama; sys_platform == "win32"',
+                    'uvloop; sys_platform != "win32" and platform.python_implementation == "CPython"',
+                    "six",
+                ],
+            }
+        },
+    )
+    py38_win, py312_linux = info.dependencies_for_environments(
+        [{"python_version": "3.8", "sys_platform": "win32"}, {"python_version": "3.12", "sys_platform": "linux"}]
+    )
+    assert [d.name for d in py38_win] == ["tomli", "colorama", "six"]
+    assert [d.name for d in py312_linux] == ["uvloop", "six"]
+
+### otlet.packaging.specifiers ###
+
+def test_specifiers() -> bool:
+    from otlet.packaging.specifiers import parse_specifier_set
+
+
+    assert parse_specifier_set("(>=1.0, <2.0)") is parse_specifier_set("(>=1.0, <2.0)")
+    assert "1.5" in parse_specifier_set("~=1.4") and "2.0" not in parse_specifier_set("~=1.4")
+    assert "1.2.3" in parse_specifier_set("==1.*") and "1.3.1" not in parse_specifier_set("!=1.3.*")
+    assert "1.0+local" in parse_specifier_set("==1.0") and "1.0rc1" not in parse_specifier_set("<1.0")
+    assert Version("2.1").fits_constraints([">=2.0", "!=2.0.1", "===2.1"])
+    assert "1.0.0rc1" not in parse_specifier_set("<1.0") and "0.9+local" in parse_specifier_set("<1.0")
+    assert "1.0+local" in parse_specifier_set("<=1.0") and "1.0.0+local" in parse_specifier_set(">=1.0")
+    assert "1.0+local" not in parse_specifier_set(">1.0") and "1.0.0.post1" not in parse_specifier_set(">1.0")
+    assert "1.0.post2" in parse_specifier_set(">1.0.post1") and "1.0.1" in parse_specifier_set(">1.0")
+
+### otlet.releases.VersionIndex ###
+
+def test_versionindex_latest() -> bool:
+    pkg = PackageObject("otlet-test-project", http_response=TEST_PROJECT)
+    item = TEST_FILE
+    versions = ["0.9", "1.0", "1.0.post1", "1.1rc1", "1.1", "1.2", "2.0.dev1", "10.0"]
+    index = VersionIndex(ReleaseTable({v: [dict(item, yanked=v == "1.2")] for v in versions}))
+    assert [str(v) for v in index.versions] == sorted(versions, key=lambda v: Version(v))
+    assert str(index.latest()) == "10.0" and str(index.latest("<10")) == "1.2"
+    assert str(index.latest("<10", allow_yanked=False)) == "1.1"
+    assert str(index.latest(["~=1.0", "!=1.2"], allow_pre=True)) == "1.1"
+    assert str(index.latest(["==1.0.*"])) == "1.0.post1" and str(index.latest(">=2", allow_pre=True)) == "10.0"
+    assert index.latest(">1.2,<10") is None and str(index.latest(">1.2,<10", allow_pre=True)) == "2.0.dev1"
+    assert pkg.version_index is pkg.version_index
+
+### otlet.packaging.version ###
+
+def test_parse_version_interned() -> bool:
+    from otlet.packaging.version import parse
+
+    assert parse("2.31.0") is parse("2.31.0") and parse("2.31.0") == Version("2.31.0")
+    assert not hasattr(parse("2.31.0"), "__dict__")
+    with pytest.raises(AttributeError):
+        parse("2.31.0")._key = ()
+
+def test_version_fast_path() -> bool:
+    from otlet.packaging.version import _parse_canonical, _parse_full
+
+    for v in ["1.0.0", "2.31.0", "2.0rc1", "1.0.post1.dev2", "3.0a2", "0.9b10.post3"]:
+        assert _parse_canonical(v) == _parse_full(v)
+    for v in ["1!2.0", "1.0-1", "v1.0", " 1.0", "1.0RC1", "1.0+local", "1.0.dev", "1.0alpha1"]:
+        assert _parse_canonical(v) is None and Version(v)._version == _parse_full(v)
+
+def test_sort_versions() -> bool:
+    from otlet.packaging.version import sort_versions, version_sort_key
+
+    ordered = ["1.0.dev1", "1.0a1.dev1", "1.0a1", "1.0b1", "1.0rc2", "1.0", "1.0+a", "1.0+a.1", "1.0+1", "1.0.post1.dev1", "1.0.post1", "1!0.1"]
+    assert sort_versions(reversed(ordered)) == ordered
+    assert sort_versions(map(Version, ordered), reverse=True) == sorted(map(Version, ordered), reverse=True)
+    assert version_sort_key("1.0") == version_sort_key("1.0.0") and version_sort_key(Version("1.0")) == version_sort_key("1.0")
+    import copy, pickle
+    from otlet.packaging.version import LegacyVersion, parse
+    for sorted_version in (parse("1.0rc1+local"), LegacyVersion("2004d")):
+        version_sort_key(sorted_version)
+        for copied in (pickle.loads(pickle.dumps(sorted_version)), copy.deepcopy(sorted_version)):
+            assert type(copied) is type(sorted_version) and copied == sorted_version
+            assert version_sort_key(copied) == version_sort_key(sorted_version)
+
+### skipping 'releases' ###
+
+def test_load_json_skip_releases() -> bool:
+    from otlet.api import _load_json
+
+    body = b'{"info": {"name": "x"}, "releases": {"1.0": [{"a": [1, "}"]}]}, "last_serial": 3}'
+    assert _load_json(body, "releases") == {"info": {"name": "x"}, "releases": {}, "last_serial": 3}
+    assert _load_json(body) == json.loads(body)
+    pkg = PackageObject("otlet-test-project", skip_releases=True)
+    assert pkg.http_response["releases"] == {} and len(pkg.releases) == 0 and pkg.info.name
+
+### compressed responses ###
+
+def test_session_gzip_stats() -> bool:
+    import gzip
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    payload = json.dumps({"releases": list(range(5000))}).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = gzip.compress(payload) if "gzip" in self.headers["Accept-Encoding"] else payload
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.handle_request, daemon=True).start()
+    stats = []
+    with Session(stats_hook=stats.append) as s:
+        assert s.get(f"http://127.0.0.1:{server.server_port}/pypi/x/json").body == payload
+    server.server_close()
+    assert stats[0].content_encoding == "gzip" and stats[0].body_bytes == len(payload)
+    assert stats[0].wire_bytes < len(payload)
+
+### otlet.mirror ###
+
+def _fake_response(name, version, requires_dist=None):
+    item = TEST_FILE
+    info = {"name": name, "version": version, "requires_dist": requires_dist}
+    return {"info": info, "releases": {version: [item]}, "urls": [item], "vulnerabilities": [], "last_serial": 1}
+
+
+def test_mirror_snapshot(tmp_path) -> bool:
+    from otlet.mirror import MirrorSource, snapshot
+
+    source = tmp_path / "source"
+    for name, deps in (("Mirror_Root", ["mirror-dep>=1.0"]), ("mirror-dep", None)):
+        body = json.dumps(_fake_response(name, "1.0", deps))
+        for path in (f"pypi/{name.lower().replace('_', '-')}/json", f"pypi/{name.lower().replace('_', '-')}/1.0/json"):
+            (source / path).parent.mkdir(parents=True, exist_ok=True)
+            (source / path).write_text(body)
+
+    written = snapshot(["Mirror_Root"], str(tmp_path / "mirror.zip"), session=MirrorSource(str(source)))
+    assert sorted(written) == ["pypi/mirror-dep/1.0/json", "pypi/mirror-dep/json", "pypi/mirror-root/1.0/json", "pypi/mirror-root/json"]
+    with MirrorSource(str(tmp_path / "mirror.zip")) as mirror:
+        pkg = PackageObject("mirror.root", "1.0", session=mirror)
+        assert pkg.dependencies[0].get_latest_possible_version() == Version("1.0")
+        with pytest.raises(PyPIPackageNotFound):
+            PackageObject("not-mirrored", session=mirror)
+
+### otlet.sync ###
+
+def test_sync_refetches_changed(tmp_path) -> bool:
+    from http.client import HTTPMessage
+    from otlet.session import HTTPResponse
+
+    serials = {"sync-a": 10, "sync-b": 20}
+    requests = []
+
+    class FakeSession:
+        cache = None
+        source_key = "fake-pypi"
+
+        def request(self, method, url, headers=None):
+            name = canonicalize_name(url.split("/")[-2])
+            requests.append((method, name))
+            headers = HTTPMessage()
+            headers["X-PyPI-Last-Serial"] = str(serials[name])
+            body = dict(_fake_response(name, "1.0"), last_serial=serials[name])
+            return HTTPResponse(url, 200, "OK", headers, b"" if method == "HEAD" else json.dumps(body).encode())
+
+        def get(self, url, headers=None):
+            return self.request("GET", url, headers)
+
+    path = str(tmp_path / "state.json")
+    memo = PackageMemo()
+    first = sync_packages(["sync-a", "Sync_B"], SyncState(path), session=FakeSession(), memo=memo)
+    assert all(r.ok and r.changed for r in first) and SyncState(path).serials == serials
+
+    serials["sync-b"] = 21
+    requests.clear()
+    second = sync_packages(["sync-a", "Sync_B"], SyncState(path), session=FakeSession(), memo=memo)
+    assert [(r.changed, r.serial) for r in second] == [(False, 10), (True, 21)]
+    assert second[0].package is first[0].package and second[1].package is not first[1].package
+    assert sorted(requests) == [("GET", "sync-b"), ("HEAD", "sync-a"), ("HEAD", "sync-b")]
+
+    requests.clear()
+    third = sync_packages(["sync-a", "sync-b"], SyncState(path), changelog=[("sync-b", "2.0", 0, "new release", 21)], session=FakeSession(), memo=memo)
+    assert not requests and not any(r.changed for r in third)
+
+    # unchanged packages missing from the memo are rebuilt from the response cache
+    from otlet.api import _package_url
+    FakeSession.cache = ResponseCache(str(tmp_path / "cache"))
+    FakeSession.cache.store(_package_url("sync-a"), json.dumps(_fake_response("sync-a", "1.0")).encode(), last_serial=10)
+    fourth = sync_packages(["sync-a"], SyncState(path), session=FakeSession(), memo=PackageMemo(), raw_timestamps=True)
+    assert fourth[0].ok and not fourth[0].changed and isinstance(fourth[0].package.upload_time, int)
+    assert requests == [("HEAD", "sync-a")]
+
+    import otlet.sync
+    assert otlet.sync.SyncState is SyncState
+
+### upload times ###
+
+def test_upload_time_parsing() -> bool:
+    from otlet.util import _parse_upload_time, _upload_timestamp
+
+    assert _parse_upload_time("2022-07-01T15:04:05.123456Z") == datetime.datetime(2022, 7, 1, 15, 4, 5)
+    assert _upload_timestamp("2022-07-01T15:04:05") == 1656687845
+    pkg = PackageObject("otlet-test-project", raw_timestamps=True)
+    assert pkg.upload_time == _upload_timestamp(pkg.http_response["urls"][0]["upload_time"])
+    assert isinstance(next(iter(pkg.releases.values())).upload_time, int)